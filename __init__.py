@@ -5,19 +5,66 @@ A Python library and CLI utility that analyzes system commands and generates
 callable wrappers or MCP plugin files.
 """
 
-import platform
-import subprocess
-import time
+import hashlib
+import importlib
+import json
 import os
-from typing import Optional, Union
+import platform
+import shutil
+import tempfile
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Union
 
 from models import CommandSpec, ExecutionResult
-from parser.base import BaseParser
-from parser.windows import WindowsParser
-from parser.posix import PosixParser
-from generator.wrapper_builder import WrapperBuilder
-from generator.file_writer import FileWriter
-from wrapper import CommandWrapper
+from parser.base import BaseParser, _map_threaded, _parser_fingerprint
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime to keep CLI startup cheap
+    from generator.file_writer import FileWriter
+    from generator.wrapper_builder import WrapperBuilder
+    from wrapper import CommandWrapper
+
+
+# Host platform, resolved once per process rather than per UCW instance
+_SYSTEM = platform.system().lower()
+_DEFAULT_PLATFORM = {"windows": "windows", "linux": "posix", "darwin": "posix"}.get(_SYSTEM)
+
+# Bump whenever the serialized layout of the models changes
+_SPEC_CACHE_VERSION = 4
+
+# In-process layer over the disk cache, keyed by cache file path
+_SPEC_MEMO = {}
+_SPEC_MEMO_SIZE = 512
+
+# Public names whose modules are only imported on first access (PEP 562),
+# so "from ucw import CommandWrapper" keeps working without slowing startup
+_LAZY_EXPORTS = {
+    'WindowsParser': 'parser.windows',
+    'PosixParser': 'parser.posix',
+    'WrapperBuilder': 'generator.wrapper_builder',
+    'FileWriter': 'generator.file_writer',
+    'CommandWrapper': 'wrapper',
+}
+
+
+def __getattr__(name: str):
+    """Import a lazily exported name on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def _spec_cache_dir() -> Path:
+    """Directory holding cached CommandSpec JSON files."""
+    override = os.environ.get('UCW_CACHE_DIR')
+    if override:
+        return Path(override) / 'specs'
+    base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return Path(base) / 'ucw' / 'specs'
 
 
 class UniversalCommandWrapper:
@@ -50,31 +97,48 @@ class UniversalCommandWrapper:
             self.timeout_exec = timeout_exec or 30
         
         self.parser = self._create_parser()
-        self.wrapper_builder = WrapperBuilder(timeout_exec=self.timeout_exec)
-        self.file_writer = FileWriter()
+        self._wrapper_builder = None
+        self._file_writer = None
+    
+    @property
+    def wrapper_builder(self) -> "WrapperBuilder":
+        """WrapperBuilder configured with the execution timeout (created on first use)."""
+        if self._wrapper_builder is None:
+            from generator.wrapper_builder import WrapperBuilder
+            self._wrapper_builder = WrapperBuilder(timeout_exec=self.timeout_exec)
+        return self._wrapper_builder
+    
+    @property
+    def file_writer(self) -> "FileWriter":
+        """FileWriter for generated plugin files (created on first use)."""
+        if self._file_writer is None:
+            from generator.file_writer import FileWriter
+            self._file_writer = FileWriter(self.wrapper_builder)
+        return self._file_writer
     
     def _detect_platform(self) -> str:
         """Detect the current platform."""
-        system = platform.system().lower()
-        if system == "windows":
-            return "windows"
-        elif system in ["linux", "darwin"]:
-            return "posix"
-        else:
-            raise ValueError(f"Unsupported platform: {system}")
+        if _DEFAULT_PLATFORM is None:
+            raise ValueError(f"Unsupported platform: {_SYSTEM}")
+        return _DEFAULT_PLATFORM
     
     def _create_parser(self) -> BaseParser:
         """Create the appropriate parser for the platform."""
+        # Parsers are imported on demand so only the one in use is loaded
         if self.platform == "windows":
+            from parser.windows import WindowsParser
             return WindowsParser(timeout=self.timeout_help)
         elif self.platform == "posix":
+            from parser.posix import PosixParser
             return PosixParser(timeout=self.timeout_help)
         elif self.platform == "auto":
             # Auto-detect platform
             detected = self._detect_platform()
             if detected == "windows":
+                from parser.windows import WindowsParser
                 return WindowsParser(timeout=self.timeout_help)
             elif detected == "posix":
+                from parser.posix import PosixParser
                 return PosixParser(timeout=self.timeout_help)
             else:
                 raise ValueError(f"Unsupported platform: {detected}")
@@ -85,13 +149,112 @@ class UniversalCommandWrapper:
         """
         Parse a command's help/man page into structured specification.
         
+        Parsed specs are cached on disk keyed on the resolved executable path,
+        its modification time and size, and the parser source, so re-wrapping
+        an unchanged command skips the help subprocess entirely. Specs are
+        also kept in memory for the lifetime of the process. Set
+        UCW_CACHE_DISABLE=1 to bypass the cache, or UCW_CACHE_DIR to
+        relocate it.
+        
         Args:
             command_name: Name of the command to parse
             
         Returns:
             CommandSpec object with parsed information
         """
-        return self.parser.parse_command(command_name)
+        cache_path = self._spec_cache_path(command_name)
+        if cache_path is not None:
+            cached = _SPEC_MEMO.get(cache_path)
+            if cached is not None:
+                # Callers get their own options list; the memo stays intact
+                return replace(cached, options=list(cached.options))
+            try:
+                with open(cache_path, 'rb') as f:
+                    spec = CommandSpec.from_dict(json.loads(f.read()))
+                self._remember_spec(cache_path, spec)
+                return spec
+            except Exception:
+                # Missing or unreadable cache entry - fall through and reparse
+                pass
+        
+        spec = self.parser.parse_command(command_name)
+        
+        # Only cache specs that carry information; failed help lookups stay uncached
+        if cache_path is not None and (spec.usage or spec.options or spec.positional_args):
+            self._remember_spec(cache_path, spec)
+            self._store_cached_spec(cache_path, spec)
+        
+        return spec
+    
+    def parse_many(self, command_names: List[str], max_workers: Optional[int] = None) -> List[CommandSpec]:
+        """
+        Parse several commands on a thread pool, like BaseParser.parse_many.
+        
+        Each command goes through this class's parse_command, so cached
+        specs skip the help subprocess.
+        
+        Args:
+            command_names: Names of the commands to parse
+            max_workers: Thread pool size (default os.cpu_count() * 4)
+            
+        Returns:
+            CommandSpec objects in the same order as command_names
+        """
+        return _map_threaded(self.parse_command, command_names, max_workers)
+    
+    def _remember_spec(self, cache_path: Path, spec: CommandSpec) -> None:
+        """Keep a spec in the in-process cache, dropping it all once full."""
+        if len(_SPEC_MEMO) >= _SPEC_MEMO_SIZE:
+            _SPEC_MEMO.clear()
+        _SPEC_MEMO[cache_path] = replace(spec, options=tuple(spec.options))
+    
+    def _spec_cache_path(self, command_name: str) -> Optional[Path]:
+        """Get the spec cache file for a command, or None if caching does not apply."""
+        if not isinstance(command_name, str) or not command_name:
+            return None
+        if os.environ.get('UCW_CACHE_DISABLE', '').lower() in ('1', 'true', 'yes'):
+            return None
+        
+        # Parser source changes alter parse output, so they invalidate the
+        # cache just like a changed executable does
+        fingerprint = _parser_fingerprint(type(self.parser))
+        if fingerprint is None:
+            return None
+        
+        path = shutil.which(command_name)
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        
+        # Size catches rewrites that preserve the mtime (e.g. package
+        # managers restoring timestamps)
+        key_source = (
+            f"{_SPEC_CACHE_VERSION}|{type(self.parser).__name__}|{fingerprint}|{command_name}"
+            f"|{path}|{stat.st_mtime_ns}|{stat.st_size}"
+        )
+        key = hashlib.blake2b(key_source.encode('utf-8'), digest_size=16).hexdigest()
+        return _spec_cache_dir() / f"{key}.json"
+    
+    def _store_cached_spec(self, cache_path: Path, spec: CommandSpec) -> None:
+        """Write a spec to the cache atomically, ignoring filesystem errors."""
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per write; concurrent threads share one pid
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(spec.to_dict(), f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Caching is best-effort; never fail a parse because of it
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
     
     def build_wrapper(self, spec: CommandSpec) -> "CommandWrapper":
         """
@@ -6,12 +6,24 @@ SMCP-compatible plugin for generating Python wrappers for system commands.
 """
 
 import argparse
+import functools
 import json
 import sys
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
-from __init__ import UniversalCommandWrapper
+try:
+    # Optional faster JSON encoder for CLI output
+    import orjson
+except ImportError:
+    orjson = None
+
+if __package__:
+    # Imported as a submodule of the plugin package (e.g. ucw.cli): reuse the
+    # already-loaded package instead of executing __init__.py a second time
+    from . import UniversalCommandWrapper
+else:
+    from __init__ import UniversalCommandWrapper
 
 
 def main():
@@ -26,10 +38,20 @@ def main():
     
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
-    # Add commands
-    setup_wrap_command(subparsers)
-    setup_parse_command(subparsers)
-    setup_execute_command(subparsers)
+    # Add commands. Building argparse parsers is comparatively expensive, so
+    # when a known subcommand was requested only that one is set up; the full
+    # tree is built for top-level help and for unknown or missing commands.
+    command_setups = {
+        "wrap": setup_wrap_command,
+        "parse": setup_parse_command,
+        "execute": setup_execute_command,
+    }
+    requested = _requested_command(sys.argv[1:])
+    if requested in command_setups:
+        command_setups[requested](subparsers)
+    else:
+        for setup_command in command_setups.values():
+            setup_command(subparsers)
     
     args = parser.parse_args()
     
@@ -53,7 +75,7 @@ def main():
             print_human_readable(result)
         else:
             # Output JSON result for SMCP compatibility
-            print(json.dumps(result, indent=2))
+            _print_json(result)
         
         # Exit with error code if there was an error
         if result.get("status") == "error":
@@ -64,10 +86,55 @@ def main():
         if args.standalone:
             print(f"Error: {error_result['error']}")
         else:
-            print(json.dumps(error_result, indent=2))
+            _print_json(error_result)
         sys.exit(1)
 
 
+@functools.lru_cache(maxsize=8)
+def _get_ucw(platform_name: Optional[str], timeout_help: int,
+             timeout_exec: int) -> UniversalCommandWrapper:
+    """Get a shared UniversalCommandWrapper for a platform/timeout configuration."""
+    # UCW holds no per-request state, so instances can be reused across commands
+    return UniversalCommandWrapper(
+        platform_name=platform_name,
+        timeout_help=timeout_help,
+        timeout_exec=timeout_exec
+    )
+
+
+def _requested_command(argv: List[str]) -> Optional[str]:
+    """Return the subcommand named on the command line, if any."""
+    for arg in argv:
+        if not arg.startswith('-'):
+            return arg
+    return None
+
+
+def _dumps(result: Dict[str, Any]) -> bytes:
+    """Serialize a result as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    # Keep non-ASCII text unescaped, as orjson does
+    return json.dumps(result, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _print_json(result: Dict[str, Any]) -> None:
+    """
+    Write a result to stdout as UTF-8 JSON, whatever the console encoding.
+    
+    Printing the text instead would raise UnicodeEncodeError for non-ASCII
+    help on a cp1252 console or under a non-UTF-8 locale.
+    """
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        # Text-only replacement stream: ASCII escapes encode everywhere
+        print(json.dumps(result, indent=2))
+        return
+    sys.stdout.flush()
+    buffer.write(_dumps(result) + b'\n')
+    buffer.flush()
+
+
 def print_human_readable(result: Dict[str, Any]):
     """Print result in human-readable format for standalone usage."""
     if result.get("status") == "error":
@@ -212,11 +279,7 @@ def execute_wrap_command(args) -> Dict[str, Any]:
         
         # Initialize UCW
         platform_name = args.platform if args.platform != "auto" else None
-        ucw = UniversalCommandWrapper(
-            platform_name=platform_name,
-            timeout_help=args.timeout_help,
-            timeout_exec=args.timeout_exec
-        )
+        ucw = _get_ucw(platform_name, args.timeout_help, args.timeout_exec)
         
         if args.output:
             # Generate file
@@ -292,11 +355,7 @@ def execute_parse_command(args) -> Dict[str, Any]:
         
         # Initialize UCW
         platform_name = args.platform if args.platform != "auto" else None
-        ucw = UniversalCommandWrapper(
-            platform_name=platform_name,
-            timeout_help=args.timeout_help,
-            timeout_exec=args.timeout_exec
-        )
+        ucw = _get_ucw(platform_name, args.timeout_help, args.timeout_exec)
         
         # Parse command
         spec = ucw.parse_command(args.command_name)
@@ -342,11 +401,7 @@ def execute_execute_command(args) -> Dict[str, Any]:
         
         # Initialize UCW
         platform_name = args.platform if args.platform != "auto" else None
-        ucw = UniversalCommandWrapper(
-            platform_name=platform_name,
-            timeout_help=args.timeout_help,
-            timeout_exec=args.timeout_exec
-        )
+        ucw = _get_ucw(platform_name, args.timeout_help, args.timeout_exec)
         
         # Parse command and build wrapper
         spec = ucw.parse_command(args.command_name)
@@ -5,18 +5,40 @@ This module handles writing generated wrappers to CLI files,
 including updating existing files with section tagging.
 """
 
+import functools
+import hashlib
+import inspect
+import json
 import os
-from typing import Optional
+import re
+import sys
+import tempfile
+from typing import Dict, Optional, Tuple
 
 from models import CommandSpec
 from .wrapper_builder import WrapperBuilder
 
 
+# Matches every UCW section marker; the literal prefix keeps the scan fast
+_SECTION_RE = re.compile(r'# UCW-(BEGIN|END): (\S+)')
+
+
+@functools.lru_cache(maxsize=None)
+def _generator_fingerprint(builder_cls: type) -> Optional[str]:
+    """Hash of the module defining a wrapper builder, or None if its source is unavailable."""
+    try:
+        source = inspect.getsource(sys.modules[builder_cls.__module__])
+    except (KeyError, OSError, TypeError):
+        return None
+    return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+
+
 class FileWriter:
     """Writer for CLI files."""
     
-    def __init__(self):
-        self.wrapper_builder = WrapperBuilder()
+    def __init__(self, wrapper_builder: Optional[WrapperBuilder] = None):
+        # Reuse the caller's builder so generated files honour its timeout config
+        self.wrapper_builder = wrapper_builder or WrapperBuilder()
     
     def write_wrapper(self, spec: CommandSpec, wrapper, output_path: str, 
                      update: bool = False) -> str:
@@ -41,91 +63,233 @@ class FileWriter:
         """Write a new CLI file."""
         plugin_code = self.wrapper_builder.generate_mcp_plugin_code(spec)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(plugin_code)
-        
-        # Make executable on Unix systems
-        if os.name != 'nt':
-            os.chmod(output_path, 0o755)
+        # New files are made executable on Unix systems
+        self._write_file(output_path, plugin_code, mode=0o755 if os.name != 'nt' else 0o644)
         
         return output_path
     
     def _update_existing_file(self, spec: CommandSpec, wrapper, output_path: str) -> str:
         """Update existing CLI file with new wrapper."""
-        # Read existing file
-        with open(output_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read the raw bytes once; they double as the unchanged-file check
+        with open(output_path, 'rb') as f:
+            raw = f.read()
+        content = raw.decode('utf-8')
+        
+        # Index all sections once; the index is reused by _update_wrapper_section
+        sections = self._index_sections(content)
         
         # Check if this is a fresh file (no UCW markers)
-        if "# UCW-BEGIN:" not in content and "# UCW-END:" not in content:
+        if not sections:
             # This is a fresh file, replace it entirely with the new command
             plugin_code = self.wrapper_builder.generate_mcp_plugin_code(spec)
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(plugin_code)
+            self._write_file(output_path, plugin_code, existing=raw)
             return output_path
         
         # This is an existing UCW-managed file, update the command section
+        begin_idx, end_idx, _ = self._locate_section(content, spec.name, sections)
+        begin_tag = f"# UCW-BEGIN: {spec.name}"
+        end_tag = f"# UCW-END: {spec.name}"
+        
+        # A matching hash line means the section was generated from the same
+        # inputs, so even regenerating the code can be skipped
+        section_hash = self._section_hash(spec)
+        hash_line = f"# UCW-HASH: {section_hash}" if section_hash else None
+        if hash_line and begin_idx != -1 and \
+                content.startswith(f"{begin_tag}\n{hash_line}\n", begin_idx):
+            return output_path
+        
         # Generate new wrapper code
         plugin_code = self.wrapper_builder.generate_mcp_plugin_code(spec)
         
         # Extract the command-specific parts
         new_wrapper_code = self._extract_wrapper_code(plugin_code, spec.name)
+        if hash_line:
+            new_wrapper_code = f"{hash_line}\n{new_wrapper_code}"
+        
+        # Leave the file alone if the section already holds this code
+        if begin_idx != -1 and \
+                content[begin_idx:end_idx] == f"{begin_tag}\n{new_wrapper_code}\n{end_tag}":
+            return output_path
         
         # Update or add wrapper section
-        updated_content = self._update_wrapper_section(content, spec.name, new_wrapper_code)
+        updated_content = self._update_wrapper_section(content, spec.name, new_wrapper_code,
+                                                       sections=sections)
         
         # Write updated file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        self._write_file(output_path, updated_content, existing=raw)
         
         return output_path
     
+    def _section_hash(self, spec: CommandSpec) -> Optional[str]:
+        """
+        Hash the inputs that determine a command's generated section.
+        
+        The hash covers the spec, the exec timeout and the generator source,
+        so any change that could alter the generated code changes the hash.
+        
+        Args:
+            spec: CommandSpec object
+            
+        Returns:
+            Hex digest, or None if the inputs cannot be fingerprinted
+        """
+        fingerprint = _generator_fingerprint(type(self.wrapper_builder))
+        if fingerprint is None:
+            return None
+        try:
+            spec_json = json.dumps(spec.to_dict(), sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        timeout = getattr(self.wrapper_builder, 'timeout_exec', None)
+        source = f"{fingerprint}|{timeout}|{spec_json}"
+        return hashlib.blake2b(source.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def _write_file(self, output_path: str, content: str,
+                    existing: Optional[bytes] = None, mode: Optional[int] = None) -> None:
+        """
+        Atomically write content to a file, skipping the write if unchanged.
+        
+        Leaving byte-identical files untouched keeps their mtime stable, so
+        repeated regeneration does not trigger downstream rebuilds.
+        
+        Args:
+            output_path: Path to output file
+            content: Full file content to write
+            existing: Current file bytes, if already read by the caller
+            mode: Permission bits for the file (defaults to the existing
+                  file's mode)
+        """
+        data = content.encode('utf-8')
+        # Write through symlinks: the swap below must replace the link's
+        # target, not the link itself
+        output_path = os.path.realpath(output_path)
+        
+        # Compare against the current contents before touching the file. The
+        # read doubles as the directory check and, via fstat, the mode lookup.
+        if existing is None:
+            try:
+                with open(output_path, 'rb') as f:
+                    existing = f.read()
+                    if mode is None:
+                        mode = os.fstat(f.fileno()).st_mode & 0o777
+            except IsADirectoryError:
+                # Fail like a direct open() would rather than replacing a directory
+                raise
+            except OSError:
+                pass
+        if existing == data:
+            return
+        
+        # Preserve the mode of an existing file unless one was requested
+        if mode is None:
+            try:
+                mode = os.stat(output_path).st_mode & 0o777
+            except OSError:
+                mode = 0o644
+        
+        # Write the encoded buffer to a uniquely named temporary file in the
+        # same directory, then swap it in
+        directory, name = os.path.split(output_path)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{name}.", suffix='.tmp')
+        try:
+            try:
+                if hasattr(os, 'fchmod'):
+                    # mkstemp creates the file 0o600; set the requested mode exactly
+                    os.fchmod(fd, mode)
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    
     def _extract_wrapper_code(self, plugin_code: str, command_name: str) -> str:
         """Extract the command-specific code from plugin code."""
-        # Extract only the command-specific functions, not the full plugin structure
-        lines = plugin_code.split('\n')
-        command_lines = []
-        in_command_section = False
-        
-        for line in lines:
-            # Look for command-specific functions
-            if (line.strip().startswith(f'def setup_execute_command') or
-                line.strip().startswith(f'def execute_command')):
-                in_command_section = True
+        # Extract only the command-specific functions, not the full plugin structure.
+        # Slice the plugin code directly instead of splitting it into lines.
+        starts = [idx for idx in (plugin_code.find('def setup_execute_command'),
+                                  plugin_code.find('def execute_command'))
+                  if idx != -1]
+        if not starts:
+            return ""
+        
+        # Start at the beginning of the line holding the first command function
+        start = plugin_code.rfind('\n', 0, min(starts)) + 1
+        
+        # Stop at the end of the execute_command function (the if __name__ line)
+        end = plugin_code.find('\nif __name__', start)
+        if end == -1:
+            return plugin_code[start:]
+        end = plugin_code.find('\n', end + 1)
+        return plugin_code[start:end if end != -1 else None]
+    
+    def _index_sections(self, content: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Index all UCW sections in the content with a single regex scan.
+        
+        Args:
+            content: Existing file content
             
-            if in_command_section:
-                command_lines.append(line)
-                
-                # Stop at the end of the execute_command function (before if __name__)
-                if line.strip().startswith('if __name__'):
-                    break
-        
-        return '\n'.join(command_lines)
+        Returns:
+            Dict mapping command name to (begin_idx, end_idx), where end_idx
+            points just past the end tag. Commands with unbalanced markers map
+            to (-1, -1) so that marker presence is still recorded.
+        """
+        sections = {}
+        begins = {}
+        for match in _SECTION_RE.finditer(content):
+            kind, name = match.groups()
+            if kind == 'BEGIN':
+                begins.setdefault(name, match.start())
+                sections.setdefault(name, (-1, -1))
+            elif name in begins and sections.get(name, (-1, -1))[0] == -1:
+                sections[name] = (begins[name], match.end())
+            else:
+                sections.setdefault(name, (-1, -1))
+        return sections
+    
+    def _locate_section(self, content: str, command_name: str,
+                        sections: Optional[Dict[str, Tuple[int, int]]] = None) -> Tuple[int, int, bool]:
+        """
+        Locate the UCW section for a command.
+        
+        Args:
+            content: Existing file content
+            command_name: Name of the command whose section to locate
+            sections: Pre-built section index (built from content if omitted)
+            
+        Returns:
+            Tuple of (begin_idx, end_idx, has_markers). begin_idx/end_idx are -1
+            when the section is missing; end_idx points just past the end tag.
+        """
+        if sections is None:
+            sections = self._index_sections(content)
+        begin_idx, end_idx = sections.get(command_name, (-1, -1))
+        return begin_idx, end_idx, bool(sections)
     
     def _update_wrapper_section(self, content: str, command_name: str, 
-                               new_code: str) -> str:
+                               new_code: str,
+                               sections: Optional[Dict[str, Tuple[int, int]]] = None) -> str:
         """Update or add a wrapper section in existing content."""
         begin_tag = f"# UCW-BEGIN: {command_name}"
         end_tag = f"# UCW-END: {command_name}"
         
+        # Builds the section index when the caller did not supply one
+        start_idx, end_idx, has_markers = self._locate_section(content, command_name, sections)
+        if start_idx != -1:
+            # Replace existing section
+            return f"{content[:start_idx]}{begin_tag}\n{new_code}\n{end_tag}{content[end_idx:]}"
+        
         # Check if this is a new file (no UCW markers at all)
-        if "# UCW-BEGIN:" not in content and "# UCW-END:" not in content:
+        if not has_markers:
             # This is a fresh file, wrap the entire content in UCW markers
             return f"{begin_tag}\n{content}\n{end_tag}\n"
         
-        # Check if section already exists
-        if begin_tag in content and end_tag in content:
-            # Replace existing section
-            start_idx = content.find(begin_tag)
-            end_idx = content.find(end_tag) + len(end_tag)
-            
-            new_content = (
-                content[:start_idx] +
-                f"{begin_tag}\n{new_code}\n{end_tag}\n" +
-                content[end_idx:]
-            )
-        else:
-            # Add new section at the end
-            new_content = content + f"\n\n{begin_tag}\n{new_code}\n{end_tag}\n"
-        
-        return new_content
+        # Add new section at the end
+        return f"{content}\n\n{begin_tag}\n{new_code}\n{end_tag}\n"
@@ -5,41 +5,23 @@ This module handles building callable CommandWrapper objects from
 CommandSpec specifications.
 """
 
+import string
+from dataclasses import replace
 from typing import Dict, Any
 
 from models import CommandSpec
-from wrapper import CommandWrapper
+from wrapper import CommandWrapper, _flag_to_dest
 
 
-class WrapperBuilder:
-    """Builder for CommandWrapper objects."""
-    
-    def __init__(self, timeout_exec: int = 30):
-        self.timeout_exec = timeout_exec
-    
-    def build_wrapper(self, spec: CommandSpec) -> CommandWrapper:
-        """
-        Build a CommandWrapper from a CommandSpec.
-        
-        Args:
-            spec: CommandSpec object
-            
-        Returns:
-            CommandWrapper object
-        """
-        return CommandWrapper(spec.name, spec, timeout=self.timeout_exec)
-    
-    def generate_mcp_plugin_code(self, spec: CommandSpec) -> str:
-        """
-        Generate MCP plugin code following the plugin development guide pattern.
-        
-        Args:
-            spec: CommandSpec object
-            
-        Returns:
-            Complete MCP plugin code as string
-        """
-        template = '''#!/usr/bin/env python3
+# Upper bound on memoized plugin sources shared by all builders
+_PLUGIN_CODE_CACHE_SIZE = 256
+
+# Reserved argparse options that conflict with built-in options
+_RESERVED_OPTIONS = frozenset({'--help', '-h', '--version', '-v'})
+
+# Source template for generated MCP plugins. Literal braces are doubled,
+# str.format style.
+_PLUGIN_TEMPLATE = '''#!/usr/bin/env python3
 """
 {command_name} Plugin
 
@@ -210,7 +192,92 @@ Examples:
 if __name__ == "__main__":
     main()
 '''
+
+# The template is split into (literal, field) pairs once at import time so
+# rendering is a single join instead of re-parsing the format string per spec.
+_PLUGIN_TEMPLATE_PARTS = tuple(
+    (literal, field)
+    for literal, field, _, _ in string.Formatter().parse(_PLUGIN_TEMPLATE)
+)
+
+
+def _render_template(parts, **fields: Any) -> str:
+    """
+    Render a template pre-split by string.Formatter().parse.
+    
+    Args:
+        parts: (literal, field name or None) pairs
+        **fields: Values for the named fields
+        
+    Returns:
+        Rendered text, identical to str.format on the original template
+    """
+    chunks = []
+    for literal, field in parts:
+        chunks.append(literal)
+        if field is not None:
+            chunks.append(str(fields[field]))
+    return ''.join(chunks)
+
+
+class WrapperBuilder:
+    """Builder for CommandWrapper objects."""
+    
+    # (builder class, timeout, spec with list fields as tuples) -> plugin source
+    _PLUGIN_CODE_CACHE = {}
+    
+    def __init__(self, timeout_exec: int = 30):
+        self.timeout_exec = timeout_exec
+    
+    def build_wrapper(self, spec: CommandSpec) -> CommandWrapper:
+        """
+        Build a CommandWrapper from a CommandSpec.
+        
+        Args:
+            spec: CommandSpec object
+            
+        Returns:
+            CommandWrapper object
+        """
+        return CommandWrapper(spec.name, spec, timeout=self.timeout_exec)
+    
+    def generate_mcp_plugin_code(self, spec: CommandSpec) -> str:
+        """
+        Generate MCP plugin code following the plugin development guide pattern.
         
+        The generated source depends only on the spec and the exec timeout,
+        so identical specs are rendered once and then served from a cache.
+        
+        Args:
+            spec: CommandSpec object
+            
+        Returns:
+            Complete MCP plugin code as string
+        """
+        try:
+            # Specs are frozen dataclasses; only list-valued fields keep
+            # them from being hashable
+            frozen = replace(
+                spec,
+                options=tuple(spec.options),
+                positional_args=tuple(spec.positional_args),
+                examples=tuple(spec.examples)
+            )
+            key = (type(self), self.timeout_exec, frozen)
+            code = self._PLUGIN_CODE_CACHE.get(key)
+        except TypeError:
+            # Not a CommandSpec, or a field holds an unhashable value
+            return self._render_plugin_code(spec)
+        
+        if code is None:
+            code = self._render_plugin_code(spec)
+            if len(self._PLUGIN_CODE_CACHE) >= _PLUGIN_CODE_CACHE_SIZE:
+                self._PLUGIN_CODE_CACHE.clear()
+            self._PLUGIN_CODE_CACHE[key] = code
+        return code
+    
+    def _render_plugin_code(self, spec: CommandSpec) -> str:
+        """Render the MCP plugin source for a spec (uncached)."""
         # Generate argument definitions
         argument_definitions = self._generate_argument_definitions(spec)
         
@@ -232,7 +299,8 @@ if __name__ == "__main__":
         # Generate parameter specs for --describe
         parameter_specs = self._generate_parameter_specs(spec)
         
-        return template.format(
+        return _render_template(
+            _PLUGIN_TEMPLATE_PARTS,
             command_name=spec.name,
             argument_definitions=argument_definitions,
             positional_definitions=positional_definitions,
@@ -246,77 +314,50 @@ if __name__ == "__main__":
     
     def _normalize_dest_name(self, flag: str) -> str:
         """Normalize flag to valid Python attribute name."""
-        # Remove leading dashes and slashes
-        dest = flag.lstrip('-/')
-        
-        # Remove angle brackets for positional args (e.g., <COMMAND> -> COMMAND)
-        dest = dest.strip('<>')
-        
-        # Handle empty case
-        if not dest:
-            dest = 'empty'
-        
-        # Replace remaining dashes with underscores
-        dest = dest.replace('-', '_')
-        
-        # Handle special characters
-        if dest == '?':
-            dest = 'question'
-        elif dest.startswith('?'):
-            dest = 'question_' + dest[1:]
-        
-        # Ensure it's a valid Python identifier
-        if not dest.isidentifier():
-            # Replace invalid characters with underscores
-            import re
-            dest = re.sub(r'[^a-zA-Z0-9_]', '_', dest)
-            # Ensure it doesn't start with a number
-            if dest and dest[0].isdigit():
-                dest = '_' + dest
-        
-        return dest
+        return _flag_to_dest(flag)
     
     def _generate_argument_definitions(self, spec: CommandSpec) -> str:
         """Generate argparse argument definitions."""
         lines = []
-        
-        # Reserved argparse options that conflict with built-in options
-        reserved_options = {'--help', '-h', '--version', '-v'}
+        # Bound once; the loop body then only touches locals and the option
+        append = lines.append
+        normalize = self._normalize_dest_name
         
         for option in spec.options:
+            flag = option.flag
             # Skip reserved options to avoid conflicts
-            if option.flag in reserved_options:
+            if flag in _RESERVED_OPTIONS:
                 continue
                 
-            dest = self._normalize_dest_name(option.flag)
-            if option.is_boolean:
-                # Boolean flag
-                lines.append(f'    run_parser.add_argument("{option.flag}", action="store_true", dest="{dest}", help="{option.description or ""}")')
-            else:
+            dest = normalize(flag)
+            if option.takes_value:
                 # Value flag
-                lines.append(f'    run_parser.add_argument("{option.flag}", dest="{dest}", help="{option.description or ""}")')
+                append(f'    run_parser.add_argument("{flag}", dest="{dest}", help="{option.description or ""}")')
+            else:
+                # Boolean flag
+                append(f'    run_parser.add_argument("{flag}", action="store_true", dest="{dest}", help="{option.description or ""}")')
         
         return '\n'.join(lines) if lines else '    pass'
     
     def _generate_argument_handling(self, spec: CommandSpec) -> str:
         """Generate argument handling code."""
         lines = []
-        
-        # Reserved argparse options that conflict with built-in options
-        reserved_options = {'--help', '-h', '--version', '-v'}
+        append = lines.append
+        normalize = self._normalize_dest_name
         
         for option in spec.options:
+            flag = option.flag
             # Skip reserved options to avoid conflicts
-            if option.flag in reserved_options:
+            if flag in _RESERVED_OPTIONS:
                 continue
                 
-            dest = self._normalize_dest_name(option.flag)
-            if option.is_boolean:
-                lines.append(f'        if args.{dest}:')
-                lines.append(f'            cmd_args.append("{option.flag}")')
+            dest = normalize(flag)
+            if option.takes_value:
+                append(f'        if hasattr(args, "{dest}") and args.{dest} is not None:')
+                append(f'            cmd_args.extend(["{flag}", str(args.{dest})])')
             else:
-                lines.append(f'        if hasattr(args, "{dest}") and args.{dest} is not None:')
-                lines.append(f'            cmd_args.extend(["{option.flag}", str(args.{dest})])')
+                append(f'        if args.{dest}:')
+                append(f'            cmd_args.append("{flag}")')
         
         return '\n'.join(lines) if lines else '        pass'
     
@@ -386,12 +427,9 @@ if __name__ == "__main__":
         """Generate argument handling code for the run function (from dict args)."""
         lines = []
         
-        # Reserved argparse options that conflict with built-in options
-        reserved_options = {'--help', '-h', '--version', '-v'}
-        
         for option in spec.options:
             # Skip reserved options to avoid conflicts
-            if option.flag in reserved_options:
+            if option.flag in _RESERVED_OPTIONS:
                 continue
                 
             # Convert flag to parameter name (--some-flag -> some_flag)
@@ -440,12 +478,9 @@ if __name__ == "__main__":
         """Generate code to convert argparse args to dict for run function."""
         lines = []
         
-        # Reserved argparse options that conflict with built-in options
-        reserved_options = {'--help', '-h', '--version', '-v'}
-        
         # Add option arguments
         for option in spec.options:
-            if option.flag in reserved_options:
+            if option.flag in _RESERVED_OPTIONS:
                 continue
             param_name = self._flag_to_param_name(option.flag)
             dest = self._normalize_dest_name(option.flag)
@@ -481,9 +516,6 @@ if __name__ == "__main__":
         """Generate parameter specifications for --describe output."""
         lines = []
         
-        # Reserved argparse options that conflict with built-in options
-        reserved_options = {'--help', '-h', '--version', '-v'}
-        
         # Add positional arguments (as optional flags for SMCP)
         for arg in spec.positional_args:
             param_name = self._normalize_dest_name(arg.name).lower()
@@ -501,7 +533,7 @@ if __name__ == "__main__":
         
         # Add option arguments
         for option in spec.options:
-            if option.flag in reserved_options:
+            if option.flag in _RESERVED_OPTIONS:
                 continue
             param_name = self._flag_to_param_name(option.flag)
             param_type = self._map_type_hint_to_json_type(option.type_hint or 'str')
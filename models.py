@@ -5,28 +5,77 @@ This module defines the fundamental data structures used throughout UCW
 for representing command specifications, options, and execution results.
 """
 
+import sys
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+# On Python 3.10+ model instances drop the per-instance __dict__, which
+# matters when thousands of options are parsed in one run
+_SLOTS_DATACLASS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Parsed specs are also immutable
+_SPEC_DATACLASS = {"frozen": True, **_SLOTS_DATACLASS}
+
+
+def _intern_type_hint(data: dict) -> dict:
+    """Intern a deserialized type hint so specs loaded from JSON share one string per hint."""
+    hint = data.get("type_hint")
+    if hint is not None:
+        data["type_hint"] = sys.intern(hint)
+    return data
+
+
+def _intern_option(data: dict) -> dict:
+    """Intern a deserialized option's flag and type hint; flags like --help recur across commands."""
+    data["flag"] = sys.intern(data["flag"])
+    return _intern_type_hint(data)
+
+
+@dataclass(**_SPEC_DATACLASS)
 class CommandSpec:
     """Represents a parsed command specification."""
     name: str
     usage: str
     options: List["OptionSpec"]
-    positional_args: List["PositionalArgSpec"] = None
+    positional_args: Tuple["PositionalArgSpec", ...] = ()
     description: str = ""
-    examples: List[str] = None
+    examples: Tuple[str, ...] = ()
     
     def __post_init__(self):
-        if self.examples is None:
-            self.examples = []
+        # Callers may still pass None for the optional sequences; the
+        # instance is frozen, so bypass its __setattr__
         if self.positional_args is None:
-            self.positional_args = []
+            object.__setattr__(self, "positional_args", ())
+        if self.examples is None:
+            object.__setattr__(self, "examples", ())
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "name": self.name,
+            "usage": self.usage,
+            "options": [option.to_dict() for option in self.options],
+            "positional_args": [arg.to_dict() for arg in self.positional_args],
+            "description": self.description,
+            "examples": list(self.examples)
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "CommandSpec":
+        """Rebuild a CommandSpec from the output of to_dict()."""
+        return cls(
+            name=data["name"],
+            usage=data["usage"],
+            options=[OptionSpec(**_intern_option(option)) for option in data["options"]],
+            positional_args=tuple(
+                PositionalArgSpec(**_intern_type_hint(arg)) for arg in data["positional_args"]
+            ),
+            description=data["description"],
+            examples=tuple(data["examples"])
+        )
 
 
-@dataclass
+@dataclass(**_SPEC_DATACLASS)
 class OptionSpec:
     """Represents a command option/flag."""
     flag: str
@@ -40,9 +89,20 @@ class OptionSpec:
     def is_boolean(self) -> bool:
         """Check if this is a boolean flag (no value)."""
         return not self.takes_value
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "flag": self.flag,
+            "takes_value": self.takes_value,
+            "description": self.description,
+            "type_hint": self.type_hint,
+            "required": self.required,
+            "default": self.default
+        }
 
 
-@dataclass
+@dataclass(**_SPEC_DATACLASS)
 class PositionalArgSpec:
     """Represents a positional argument."""
     name: str
@@ -55,9 +115,19 @@ class PositionalArgSpec:
     def is_optional(self) -> bool:
         """Check if this argument is optional (wrapped in brackets)."""
         return not self.required
+    
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "name": self.name,
+            "required": self.required,
+            "variadic": self.variadic,
+            "description": self.description,
+            "type_hint": self.type_hint
+        }
 
 
-@dataclass
+@dataclass(**_SLOTS_DATACLASS)
 class ExecutionResult:
     """Represents the result of command execution."""
     command: str
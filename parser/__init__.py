@@ -5,6 +5,6 @@ This module provides the abstract base class and common functionality
 for parsing command help text across different platforms.
 """
 
-from .base import BaseParser
+from .base import BaseParser, HELP_WORKERS_PER_CPU
 
-__all__ = ['BaseParser']
+__all__ = ['BaseParser', 'HELP_WORKERS_PER_CPU']
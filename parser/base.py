@@ -5,19 +5,413 @@ This module provides the abstract base class and common functionality
 for parsing command help text across different platforms.
 """
 
+import asyncio
+import atexit
+import functools
+import hashlib
+import inspect
+import json
+import os
+import queue
+import shlex
+import shutil
+import string
 import subprocess
 import re
+import sys
+import tempfile
+import threading
+import time
+import uuid
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from itertools import islice
+from pathlib import Path
+from typing import FrozenSet, List, Optional, Tuple
 
 from models import CommandSpec, OptionSpec, PositionalArgSpec
 
 
+# Option patterns stripped from usage lines before positional arguments are
+# extracted, fused into one alternation so the usage line is scanned once.
+# Every alternative opens with a literal '[', which is factored out so the
+# engine only tries the alternation at bracket positions. Alternatives are
+# tried in list order; patterns already covered by an earlier alternative
+# ([-t], [-h], [-oLEVEL], [-d debugopts], [flag], ...) are not listed.
+_OPTION_STRIP_RE = re.compile(r'\[(?:' + '|'.join([
+    r'-?\w+\s*\|\s*--?\w+\]',  # [-v | --version] or similar
+    r'-?\w+\s*\|\s*--?\w+\s*\|\s*--?\w+\s*\|\s*--?\w+\]',  # [-p | --paginate | -P | --no-pager]
+    r'-?\w+\s*\|\s*--?\w+\s*\|\s*--?\w+\]',  # Shorter version
+    r'--?\w+\[?=?\s*<\w+>\]?\]',  # [--exec-path[=<path>]] or [--git-dir=<path>]
+    r'--?\w+\]',  # [--html-path], [--bare], [-t], [-olevel], etc.
+    r'-?\w+\s*=\s*<\w+>\]',  # [-c <name>=<value>]
+    r'-?\w+\s*<\w+>\]',  # [-C <path>]
+    r'option\]\.\.\.',
+    r'option\]',
+    r'flags?\]',  # Match [flags] or [flag]
+    r'-d\s+\w+\]',  # [-d debugopts]
+]) + ')', re.IGNORECASE)
+
+# Usage header lines: a bare "usage" line, or a line starting with usage:/syntax:/command:
+_USAGE_HEADER_RE = re.compile(
+    r'^[^\S\n]*(?:usage[^\S\n]*$|usage:|syntax:|command:)',
+    re.IGNORECASE | re.MULTILINE
+)
+# Fallback for help texts whose only header has the keyword mid-line, such as
+# zip's "Zip 3.0 (July 5th 2008). Usage:"
+_USAGE_ANYWHERE_RE = re.compile(r'usage:|syntax:|command:', re.IGNORECASE)
+_USAGE_KEYWORDS = ('usage:', 'syntax:', 'command:')
+# Hierarchical-command placeholders, told apart by match.lastgroup. The gh
+# form is listed first so "<command> <subcommand>" is not read as <command>.
+_TAG_RE = re.compile(
+    r'(?P<cmd_sub><command>\s+<subcommand>)'
+    r'|(?P<cmd><command>)'
+    r'|(?P<args>\[<args>\]|\[<args>\.\.\.\]|<args>\.\.\.)',
+    re.IGNORECASE
+)
+
+# Keyword -> type hint table used for type inference. Path keywords match at
+# the end of a word ("RFILE", "PYTHONPATH", "filenames", "filesystem"), bool
+# keywords at its start ("verbosely", "debugging"), and int keywords only with
+# common inflections ("counter", "numbered"), so "resize" does not read as a
+# size. The rest match whole words.
+_TYPE_KEYWORDS = {
+    'file': 'path', 'path': 'path', 'directory': 'path', 'directories': 'path',
+    'dir': 'path', 'source': 'path', 'dest': 'path', 'destination': 'path',
+    'target': 'path',
+    'pattern': 'str', 'string': 'str', 'text': 'str', 'name': 'str',
+    'number': 'int', 'count': 'int', 'size': 'int', 'port': 'int',
+    'verbose': 'bool', 'quiet': 'bool', 'debug': 'bool',
+}
+# Keywords only looked for in argument names; in option descriptions they are
+# mostly prose ("copy directories recursively", "make all targets")
+_POSITIONAL_ONLY_KEYWORDS = frozenset({
+    'directories', 'dir', 'source', 'dest', 'destination', 'target',
+    'pattern', 'string', 'text', 'name', 'port',
+})
+# Extra letters a keyword may take on at each side of a word, by type hint
+_KEYWORD_AFFIXES = {
+    'path': ('[a-z]*', '(?:names?|systems?|s)?'),
+    'int': ('', '(?:ers?|ed|ing|s)?'),
+    'bool': ('', '[a-z]*'),
+}
+
+
+def _keyword_re(table: dict) -> re.Pattern:
+    """
+    Compile a keyword table into one alternation over words.
+    
+    Each type hint becomes a named group, so a match reports its hint via
+    match.lastgroup and only keyword words ever reach Python code.
+    
+    Args:
+        table: Mapping of lowercase keyword to type hint
+        
+    Returns:
+        Compiled pattern to run against lowercased text
+    """
+    groups = {}
+    for word, hint in table.items():
+        groups.setdefault(hint, []).append(word)
+    alternatives = []
+    for hint, words in groups.items():
+        prefix, suffix = _KEYWORD_AFFIXES.get(hint, ('', 's?'))
+        keywords = '|'.join(sorted(words, key=len, reverse=True))
+        alternatives.append(f'{prefix}(?P<{hint}>{keywords}){suffix}')
+    return re.compile(f"(?<![a-z])(?:{'|'.join(alternatives)})(?![a-z])")
+
+
+_POSITIONAL_TYPE_RE = _keyword_re(_TYPE_KEYWORDS)
+_OPTION_TYPE_RE = _keyword_re({
+    word: hint for word, hint in _TYPE_KEYWORDS.items()
+    if word not in _POSITIONAL_ONLY_KEYWORDS
+})
+
+# Start of an examples section; searched case-insensitively in place
+_EXAMPLE_RE = re.compile(r'example', re.IGNORECASE)
+
+# Letters an option name may start with ([a-zA-Z] in the option patterns)
+_ASCII_LETTERS = frozenset(string.ascii_letters)
+
+# Usage tokens that only separate alternatives or join commands
+_SEPARATOR_TOKENS = frozenset(['|', '||', '&&', '=', '=='])
+
+# Characters that disqualify a usage token from being a positional argument
+_INVALID_CHARS = frozenset('[]|=-')
+
+# Section headings that end a multi-line usage block ("USAGE" followed by
+# "CORE COMMANDS" etc. in gh-style help) rather than starting it
+_SECTION_HEADERS = (
+    'ADDITIONAL', 'ALIAS', 'CORE', 'EXAMINE', 'EXAMPLES', 'FLAGS', 'GITHUB',
+    'GROW', 'HELP', 'INHERITED', 'OPTIONS', 'START', 'THESE', 'WORK',
+)
+
+# A usage header plus every line _match_usage may look ahead to
+_USAGE_LOOKAHEAD_LINES = 10
+
+# Upper bound on memoized usage lines per parser
+_POSITIONAL_CACHE_SIZE = 512
+
+# Help output beyond this many bytes is dropped before decoding
+_MAX_HELP_BYTES = 256 * 1024
+
+# Upper bound on memoized help texts shared by all parsers
+_HELP_CACHE_SIZE = 512
+
+# Upper bound on memoized parse results shared by all parsers
+_PARSE_CACHE_SIZE = 256
+
+# Default number of help commands run at once per CPU when parsing many
+# commands, whether on an event loop or a thread pool
+HELP_WORKERS_PER_CPU = 4
+
+# Prefixes of the messages _get_help_text returns instead of help text
+_SENTINEL_PREFIXES = (
+    "No help available for ",
+    "Help command timed out for ",
+    "Failed to get help for ",
+)
+
+# Returned for the empty command name. Every field is immutable, so one
+# instance is shared by all callers.
+_EMPTY_COMMAND_SPEC = CommandSpec(
+    name="",
+    usage="",
+    options=(),
+    positional_args=(),
+    description="",
+    examples=()
+)
+
+# Bump whenever the parser cache key or file layout changes
+_PARSER_CACHE_VERSION = 1
+
+
+def _word_prefix_length(text: str) -> int:
+    """Length of the leading run of word characters (what ^\\w+ would match)."""
+    i = 0
+    n = len(text)
+    while i < n and (text[i].isalnum() or text[i] == '_'):
+        i += 1
+    return i
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode captured subprocess output, normalizing newlines like text mode does."""
+    if len(data) > _MAX_HELP_BYTES:
+        # Nothing past this point is worth decoding; a split multi-byte
+        # character at the cut decodes to U+FFFD
+        data = data[:_MAX_HELP_BYTES]
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return data.decode('utf-8', 'replace')
+
+
+def _map_threaded(fn, items, max_workers: Optional[int] = None) -> list:
+    """
+    Apply fn to every item on a thread pool, keeping input order.
+    
+    Args:
+        fn: Callable taking one item
+        items: Items to process
+        max_workers: Thread pool size (default os.cpu_count() * HELP_WORKERS_PER_CPU)
+        
+    Returns:
+        Results in the same order as items
+    """
+    items = list(items)
+    if not items:
+        return []
+    if max_workers is None:
+        max_workers = (os.cpu_count() or 1) * HELP_WORKERS_PER_CPU
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def _parser_cache_dir() -> Path:
+    """Directory holding CommandSpec JSON files keyed by help text."""
+    override = os.environ.get('UCW_CACHE_DIR')
+    if override:
+        return Path(override) / 'parser'
+    base = os.environ.get('XDG_CACHE_HOME') or str(Path.home() / '.cache')
+    return Path(base) / 'ucw' / 'parser'
+
+
+@functools.lru_cache(maxsize=None)
+def _parser_fingerprint(parser_cls: type) -> Optional[str]:
+    """Hash of the modules defining a parser class, or None if their source is unavailable."""
+    digest = hashlib.sha256()
+    for klass in parser_cls.__mro__:
+        if not issubclass(klass, BaseParser):
+            continue
+        try:
+            source = inspect.getsource(sys.modules[klass.__module__])
+        except (KeyError, OSError, TypeError):
+            return None
+        digest.update(source.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class _ShellWorker:
+    """
+    Long-lived shell that runs help commands sent over its stdin.
+    
+    Commands that only exist inside the shell (cmd.exe builtins such as dir)
+    would otherwise start a fresh shell for every help lookup; one worker
+    serves all of them. Each command is followed by an echo of a random
+    marker, and output is read back up to that marker.
+    """
+    
+    def __init__(self):
+        self._windows = os.name == 'nt'
+        self._marker = uuid.uuid4().hex
+        self._newline = '\r\n' if self._windows else '\n'
+        self._lock = threading.Lock()
+        self._proc = None
+        self._lines = None
+    
+    def run(self, cmd: List[str], timeout: float) -> bytes:
+        """
+        Run a command in the shell and return its stdout.
+        
+        The command reads stdin from the null device and its stderr is
+        discarded, as for direct help invocations.
+        
+        Args:
+            cmd: Command and arguments
+            timeout: Seconds to wait for the command to finish
+            
+        Returns:
+            Raw stdout bytes
+            
+        Raises:
+            subprocess.TimeoutExpired: If the command does not finish in time
+            OSError: If the shell cannot be started or exits unexpectedly
+        """
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._start(timeout)
+                if self._windows:
+                    line = f"{subprocess.list2cmdline(cmd)} <NUL 2>NUL & echo. & echo {self._marker}"
+                else:
+                    line = f"{shlex.join(cmd)} </dev/null 2>/dev/null; echo; echo {self._marker}"
+                self._send(line)
+                output = self._read_until_marker(cmd, timeout)
+            except BaseException:
+                # A hung or dead shell cannot be resynchronised; respawn on next use
+                self.close()
+                raise
+        # Drop the newline echoed after the command's own output
+        return output[:-len(self._newline)]
+    
+    def close(self) -> None:
+        """Terminate the shell process, if running."""
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    
+    def _start(self, timeout: float) -> None:
+        """Spawn the shell and discard anything it prints on startup."""
+        if self._windows:
+            argv = [os.environ.get('COMSPEC', 'cmd.exe'), '/D', '/Q']
+        else:
+            argv = ['/bin/sh']
+        self._proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self._lines = queue.Queue()
+        # Pipes cannot be polled portably (select() rejects them on Windows),
+        # so a daemon thread feeds stdout lines into a queue
+        reader = threading.Thread(
+            target=self._pump,
+            args=(self._proc.stdout, self._lines),
+            daemon=True
+        )
+        reader.start()
+        self._send(f"echo {self._marker}")
+        self._read_until_marker(argv, timeout)
+    
+    def _send(self, line: str) -> None:
+        """Write one command line to the shell."""
+        self._proc.stdin.write((line + self._newline).encode('utf-8'))
+        self._proc.stdin.flush()
+    
+    @staticmethod
+    def _pump(stream, lines: queue.Queue) -> None:
+        """Copy lines from the shell's stdout into a queue; None marks EOF."""
+        for line in iter(stream.readline, b''):
+            lines.put(line)
+        lines.put(None)
+    
+    def _read_until_marker(self, cmd: List[str], timeout: float) -> bytes:
+        """Collect stdout lines up to the marker line."""
+        marker = self._marker.encode('ascii')
+        deadline = time.monotonic() + timeout
+        chunks = []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining <= 0:
+                    raise queue.Empty
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if line is None:
+                raise OSError("help shell exited unexpectedly")
+            if line.rstrip(b'\r\n') == marker:
+                return b''.join(chunks)
+            chunks.append(line)
+
+
+# Shared by every parser; created on the first command that needs a shell
+_SHELL_WORKER = None
+_SHELL_WORKER_LOCK = threading.Lock()
+
+
+def _shell_worker() -> _ShellWorker:
+    """Get the process-wide shell worker, creating it on first use."""
+    global _SHELL_WORKER
+    with _SHELL_WORKER_LOCK:
+        if _SHELL_WORKER is None:
+            _SHELL_WORKER = _ShellWorker()
+            atexit.register(_SHELL_WORKER.close)
+        return _SHELL_WORKER
+
+
 class BaseParser(ABC):
     """Abstract base class for command parsers."""
     
+    # Characters an option line can start with (after indentation). Lines
+    # starting with anything else skip _is_option_line entirely; None sends
+    # every line through it. Subclasses widen this for their option syntax.
+    _MAYBE_OPTION_FIRSTCHARS: Optional[FrozenSet[str]] = None
+    
+    # Line prefixes that are neither descriptions nor examples (usage lines,
+    # options)
+    _SKIP_PREFIXES: Tuple[str, ...] = ()
+    
+    # How many leading lines may hold the description when there is no
+    # man page NAME section
+    _DESCRIPTION_LINES = 5
+
+    
+    # (parser class, command, resolved executable, mtime) -> help text,
+    # shared across instances so repeated parses skip the subprocess
+    _HELP_CACHE = {}
+    
+    # (parser class, command, help text) -> CommandSpec with its options
+    # frozen into a tuple so the entry can be shared
+    _PARSE_CACHE = {}
+    
     def __init__(self, timeout: int = 10):
         self.timeout = timeout  # Configurable timeout for help commands
+        self._positional_args_cache = {}  # usage line -> tuple of PositionalArgSpec
     
     def parse_command(self, command_name: str) -> CommandSpec:
         """
@@ -35,49 +429,243 @@ class BaseParser(ABC):
             raise TypeError("Command name must be a string")
         if not command_name:
             # Return empty spec for empty command name
-            return CommandSpec(
-                name="",
-                usage="",
-                options=[],
-                positional_args=[],
-                description="",
-                examples=[]
-            )
+            return _EMPTY_COMMAND_SPEC
         
         help_text = self._get_help_text(command_name)
-        return self._parse_help_text(command_name, help_text)
+        return self._parse_help_text_cached(command_name, help_text)
+    
+    async def parse_commands(self, command_names: List[str]) -> List[CommandSpec]:
+        """
+        Parse several commands, running their help subprocesses concurrently.
+        
+        At most os.cpu_count() * 4 help commands run at once to bound the
+        number of open pipes.
+        
+        Args:
+            command_names: Names of the commands to parse
+            
+        Returns:
+            CommandSpec objects in the same order as command_names
+        """
+        semaphore = asyncio.Semaphore((os.cpu_count() or 1) * HELP_WORKERS_PER_CPU)
+        
+        async def parse_one(command_name: str) -> CommandSpec:
+            if not isinstance(command_name, str) or not command_name:
+                # Validation and the empty spec need no subprocess
+                return self.parse_command(command_name)
+            async with semaphore:
+                help_text = await self._get_help_text_async(command_name)
+            return self._parse_help_text_cached(command_name, help_text)
+        
+        return list(await asyncio.gather(*(parse_one(name) for name in command_names)))
+    
+    def parse_many(self, command_names: List[str], max_workers: Optional[int] = None) -> List[CommandSpec]:
+        """
+        Parse several commands from synchronous code using a thread pool.
+        
+        Help subprocesses release the GIL while they wait, so lookups
+        overlap much like parse_commands without needing an event loop.
+        
+        Args:
+            command_names: Names of the commands to parse
+            max_workers: Thread pool size (default os.cpu_count() * 4)
+            
+        Returns:
+            CommandSpec objects in the same order as command_names
+        """
+        return _map_threaded(self.parse_command, command_names, max_workers)
+    
+    def _parse_help_text_cached(self, command_name: str, help_text: str) -> CommandSpec:
+        """
+        Parse help text, reusing a cached result for identical help text.
+        
+        Results are memoized in-process first, then looked up in the
+        on-disk parser cache.
+        
+        Args:
+            command_name: Name of the command
+            help_text: Raw help text
+            
+        Returns:
+            CommandSpec object with parsed information
+        """
+        if help_text.startswith(_SENTINEL_PREFIXES):
+            # The help lookup failed; there is nothing to parse
+            return self._failed_lookup_spec(command_name)
+        
+        key = (type(self), command_name, help_text)
+        cached = self._PARSE_CACHE.get(key)
+        if cached is not None:
+            # Hand out a fresh options list; the cached entry stays intact
+            return replace(cached, options=list(cached.options))
+        
+        cache_path = self._parser_cache_path(command_name, help_text)
+        if cache_path is not None:
+            try:
+                with open(cache_path, 'rb') as f:
+                    spec = CommandSpec.from_dict(json.loads(f.read()))
+                return self._remember_spec(key, spec)
+            except Exception:
+                # Missing or unreadable cache entry - fall through and reparse
+                pass
+        
+        spec = self._parse_help_text(command_name, help_text)
+        if cache_path is not None and (spec.usage or spec.options or spec.positional_args):
+            self._store_parsed_spec(cache_path, spec)
+        return self._remember_spec(key, spec)
+    
+    def _remember_spec(self, key: Tuple[type, str, str], spec: CommandSpec) -> CommandSpec:
+        """Store a copy of spec under key in the in-process parse cache and return spec."""
+        if len(self._PARSE_CACHE) >= _PARSE_CACHE_SIZE:
+            self._PARSE_CACHE.clear()
+        self._PARSE_CACHE[key] = replace(spec, options=tuple(spec.options))
+        return spec
+    
+    def _failed_lookup_spec(self, command_name: str) -> CommandSpec:
+        """Empty spec for a command whose help lookup returned a _SENTINEL_PREFIXES message."""
+        return CommandSpec(
+            name=command_name,
+            usage="",
+            options=[],
+            positional_args=(),
+            description="",
+            examples=()
+        )
+    
+    def _parser_cache_path(self, command_name: str, help_text: str) -> Optional[Path]:
+        """
+        Get the cache file for a parse of help_text, or None if caching does not apply.
+        
+        The key covers the parser class, the source of the modules defining
+        it, the command name and the help text itself, so editing the
+        parser or upgrading the command both miss the cache. Set
+        UCW_PARSER_CACHE=0 (or UCW_CACHE_DISABLE=1) to disable it.
+        
+        Args:
+            command_name: Name of the command
+            help_text: Raw help text
+            
+        Returns:
+            Path of the cache file
+        """
+        if os.environ.get('UCW_PARSER_CACHE', '').lower() in ('0', 'false', 'no'):
+            return None
+        if os.environ.get('UCW_CACHE_DISABLE', '').lower() in ('1', 'true', 'yes'):
+            return None
+        fingerprint = _parser_fingerprint(type(self))
+        if fingerprint is None:
+            return None
+        key_source = f"{_PARSER_CACHE_VERSION}|{type(self).__name__}|{fingerprint}|{command_name}\0{help_text}"
+        digest = hashlib.sha256(key_source.encode('utf-8', 'surrogatepass')).hexdigest()
+        return _parser_cache_dir() / f"{digest}.json"
+    
+    def _store_parsed_spec(self, cache_path: Path, spec: CommandSpec) -> None:
+        """Write a parsed spec to the cache atomically, ignoring filesystem errors."""
+        tmp_path = None
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # A unique temp file per write; parse_many threads share one pid
+            fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(spec.to_dict(), f)
+            os.replace(tmp_path, cache_path)
+        except (OSError, TypeError, ValueError):
+            # Caching is best-effort; never fail a parse because of it
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+    
+    def _needs_shell(self, command_name: str) -> bool:
+        """
+        Check whether a command must be run through the system shell.
+        
+        Spawning a shell costs an extra process per call, so the default is
+        to exec commands directly. Platforms with shell builtins override this.
+        
+        Args:
+            command_name: Name of the command
+            
+        Returns:
+            True if the command has to go through the shell
+        """
+        return False
+    
+    @classmethod
+    def clear_help_cache(cls) -> None:
+        """Drop all memoized help texts and parse results."""
+        BaseParser._HELP_CACHE.clear()
+        BaseParser._PARSE_CACHE.clear()
+    
+    def _help_cache_key(self, command_name: str) -> Optional[Tuple[str, str, str, int, int]]:
+        """
+        Build the help cache key for a command.
+        
+        The key includes the resolved executable with its mtime and size, so
+        upgrading a command invalidates its cached help text.
+        
+        Args:
+            command_name: Name of the command
+            
+        Returns:
+            Cache key, or None if the command does not resolve to a file
+        """
+        path = shutil.which(command_name)
+        if path is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (type(self).__name__, command_name, path, stat.st_mtime_ns, stat.st_size)
     
     def _get_help_text(self, command_name: str) -> str:
         """
         Get help text for a command.
         
+        Successful lookups are memoized per parser class and executable;
+        failures and timeouts are retried on the next call.
+        
         Args:
             command_name: Name of the command
             
         Returns:
             Raw help text
         """
+        key = self._help_cache_key(command_name)
+        if key is not None:
+            cached = self._HELP_CACHE.get(key)
+            if cached is not None:
+                return cached
+        
         try:
             cmd = self._get_help_command(command_name)
-            # Use shell=True for Windows commands (they need it for proper execution)
-            use_shell = self.__class__.__name__ == 'WindowsParser'
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                shell=use_shell,
-                timeout=self.timeout
-            )
+            # Capture raw bytes and decode once; undecodable bytes in man
+            # pages become U+FFFD instead of raising. stderr is never read,
+            # so it goes to /dev/null rather than through a second pipe.
+            if self._needs_shell(command_name):
+                # Shell builtins reuse one long-lived shell across lookups
+                output = _shell_worker().run(cmd, self.timeout)
+            else:
+                output = subprocess.run(
+                    cmd,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    shell=False,
+                    timeout=self.timeout
+                ).stdout
+            help_text = _decode_output(output)
             
             # Accept help text if it contains meaningful content, even with non-zero return codes
             # Many commands (like Windows dir /?) return non-zero codes but provide valid help
-            if result.stdout.strip() and len(result.stdout.strip()) > 20:
-                return result.stdout
+            if len(help_text.strip()) > 20:
+                return self._remember_help(key, help_text)
             else:
                 # Try alternative help methods
                 alt_help = self._try_alternative_help(command_name)
                 if alt_help is not None and alt_help != f"No help available for {command_name}":
-                    return alt_help
+                    return self._remember_help(key, alt_help)
                 else:
                     return f"No help available for {command_name}"
                 
@@ -86,6 +674,85 @@ class BaseParser(ABC):
         except Exception as e:
             return f"Failed to get help for {command_name}: {str(e)}"
     
+    async def _get_help_text_async(self, command_name: str) -> str:
+        """
+        Get help text for a command without blocking the event loop.
+        
+        Mirrors _get_help_text, including its cache and fallback messages.
+        
+        Args:
+            command_name: Name of the command
+            
+        Returns:
+            Raw help text
+        """
+        key = self._help_cache_key(command_name)
+        if key is not None:
+            cached = self._HELP_CACHE.get(key)
+            if cached is not None:
+                return cached
+        
+        proc = None
+        try:
+            cmd = self._get_help_command(command_name)
+            if self._needs_shell(command_name):
+                proc = await asyncio.create_subprocess_shell(
+                    subprocess.list2cmdline(cmd),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=self.timeout)
+            help_text = _decode_output(stdout)
+            
+            if len(help_text.strip()) > 20:
+                return self._remember_help(key, help_text)
+            alt_help = await self._try_alternative_help_async(command_name)
+            if alt_help is not None and alt_help != f"No help available for {command_name}":
+                return self._remember_help(key, alt_help)
+            return f"No help available for {command_name}"
+        
+        except asyncio.TimeoutError:
+            return f"Help command timed out for {command_name}"
+        except Exception as e:
+            return f"Failed to get help for {command_name}: {str(e)}"
+        finally:
+            # Also reached on cancellation, so no help process outlives a
+            # cancelled batch
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+    
+    async def _try_alternative_help_async(self, command_name: str) -> Optional[str]:
+        """
+        Try alternative help methods without blocking the event loop.
+        
+        Runs _try_alternative_help in the default executor; platforms whose
+        fallbacks are plain executables override this with asyncio
+        subprocesses.
+        
+        Args:
+            command_name: Name of the command
+            
+        Returns:
+            Alternative help text, or None/"No help available ..." on failure
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._try_alternative_help, command_name)
+    
+    def _remember_help(self, key: Optional[Tuple[str, str, str, int, int]], help_text: str) -> str:
+        """Store help text under key (if any) and return it."""
+        if key is not None:
+            if len(self._HELP_CACHE) >= _HELP_CACHE_SIZE:
+                self._HELP_CACHE.clear()
+            self._HELP_CACHE[key] = help_text
+        return help_text
+    
     @abstractmethod
     def _get_help_command(self, command_name: str) -> List[str]:
         """Get the help command for the platform."""
@@ -101,135 +768,245 @@ class BaseParser(ABC):
         """Parse help text into CommandSpec."""
         pass
     
+    def _scan_help_text(self, help_text: str,
+                        lines: Optional[List[str]] = None) -> Tuple[str, List[OptionSpec], List[PositionalArgSpec]]:
+        """
+        Extract usage, options and positional arguments from one split of the text.
+        
+        The usage header is found by a regex scan of help_text; options
+        are read from the shared lines, and positional arguments from the
+        usage.
+        
+        Args:
+            help_text: Raw help text
+            lines: help_text already split on newlines, if the caller has it
+            
+        Returns:
+            Tuple of (usage, options, positional_args)
+        """
+        if lines is None:
+            lines = help_text.split('\n')
+        usage = self._find_usage(help_text, lines)
+        options = self._options_from_lines(lines)
+        return usage, options, self._extract_positional_args(usage)
+    
     def _extract_usage(self, help_text: str) -> str:
         """Extract usage line from help text."""
-        lines = help_text.split('\n')
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            line_lower = line_stripped.lower()
-            # Check if this line is a usage header (like "USAGE" or "Usage:")
-            # Match both "usage" (standalone) and "usage:" (with colon)
-            is_usage_header = (
-                line_lower == 'usage' or
-                any(keyword in line_lower for keyword in ['usage:', 'syntax:', 'command:'])
-            )
-            if is_usage_header:
-                # If the line itself contains the usage (like "Usage: command args"), return it
-                if ':' in line_stripped:
-                    usage_part = line_stripped.split(':', 1)[1].strip()
-                    if usage_part:
-                        # Collect continuation lines (indented lines that look like usage)
-                        usage_parts = [usage_part]
-                        for j in range(i + 1, min(i + 6, len(lines))):  # Look ahead up to 6 lines
-                            next_line = lines[j]
-                            next_stripped = next_line.strip()
-                            # Stop at empty line or section header
-                            if not next_stripped:
-                                break
-                            # If line is indented (starts with space) and contains usage-like chars, it's a continuation
-                            if next_line.startswith(' ') and any(c in next_stripped for c in ['<', '>', '[', ']', '-', '|']):
-                                usage_parts.append(next_stripped)
-                            else:
-                                break
-                        return ' '.join(usage_parts)
-                # Otherwise, look for the next non-empty line (multi-line format like "USAGE\n  command args")
-                for j in range(i + 1, min(i + 6, len(lines))):  # Look ahead up to 6 lines
-                    next_line = lines[j].strip()
-                    if next_line and not next_line.upper().startswith(('CORE', 'GITHUB', 'ALIAS', 'ADDITIONAL', 'HELP', 'FLAGS', 'OPTIONS', 'EXAMPLES', 'INHERITED', 'THESE', 'START', 'WORK', 'EXAMINE', 'GROW')):
-                        # Collect continuation lines
-                        usage_parts = [next_line]
-                        for k in range(j + 1, min(j + 5, len(lines))):
-                            cont_line = lines[k]
-                            cont_stripped = cont_line.strip()
-                            if not cont_stripped:
-                                break
-                            if cont_line.startswith(' ') and any(c in cont_stripped for c in ['<', '>', '[', ']', '-', '|']):
-                                usage_parts.append(cont_stripped)
-                            else:
-                                break
-                        return ' '.join(usage_parts)
-                # If no next line found, return the header line itself
-                return line_stripped
+        return self._find_usage(help_text)
+    
+    def _find_usage(self, help_text: str, lines: Optional[List[str]] = None) -> str:
+        """
+        Locate the first usage header and extract its usage.
+        
+        Headers starting a line are preferred; a keyword anywhere in a line
+        is only accepted when no such header yields a usage.
+        
+        Args:
+            help_text: Raw help text
+            lines: help_text already split on newlines, if the caller has it.
+                   Without it only the lines around each header are split.
+            
+        Returns:
+            Usage text, or "" if there is no usage header
+        """
+        for header_re, anywhere in ((_USAGE_HEADER_RE, False), (_USAGE_ANYWHERE_RE, True)):
+            line_index = 0
+            scanned = 0
+            for match in header_re.finditer(help_text):
+                if lines is None:
+                    start = help_text.rfind('\n', 0, match.start()) + 1
+                    usage = self._match_usage(self._usage_window(help_text, start), 0, anywhere)
+                else:
+                    # Count newlines only since the previous header
+                    line_index += help_text.count('\n', scanned, match.start())
+                    scanned = match.start()
+                    usage = self._match_usage(lines, line_index, anywhere)
+                if usage is not None:
+                    return usage
         return ""
     
+    def _usage_window(self, help_text: str, start: int) -> List[str]:
+        """Split just the lines _match_usage can look at, starting at offset start."""
+        end = start
+        for _ in range(_USAGE_LOOKAHEAD_LINES):
+            end = help_text.find('\n', end) + 1
+            if not end:
+                return help_text[start:].split('\n')
+        return help_text[start:end].split('\n')
+    
+    def _match_usage(self, lines: List[str], i: int, anywhere: bool = False) -> Optional[str]:
+        """
+        Return the usage text if lines[i] is a usage header, otherwise None.
+        
+        With anywhere set, a usage keyword anywhere in the line counts as a
+        header, not just one at its start.
+        """
+        line_stripped = lines[i].strip()
+        line_lower = line_stripped.lower()
+        # Check if this line is a usage header (like "USAGE" or "Usage:")
+        # Match both "usage" (standalone) and "usage:" (with colon)
+        is_usage_header = (
+            line_lower == 'usage' or
+            line_lower.startswith(_USAGE_KEYWORDS) or
+            (anywhere and any(keyword in line_lower for keyword in _USAGE_KEYWORDS))
+        )
+        if is_usage_header:
+            # Every line the look-ahead below can reach, stripped once
+            window = lines[i:i + _USAGE_LOOKAHEAD_LINES]
+            stripped = [line_stripped] + [line.strip() for line in window[1:]]
+            # If the line itself contains the usage (like "Usage: command args"), return it
+            colon = line_stripped.find(':')
+            if colon != -1:
+                usage_part = line_stripped[colon + 1:].strip()
+                if usage_part:
+                    # Collect continuation lines (indented lines that look like usage)
+                    usage_parts = [usage_part]
+                    for j in range(1, min(6, len(window))):  # Look ahead up to 6 lines
+                        next_stripped = stripped[j]
+                        # Stop at empty line or section header
+                        if not next_stripped:
+                            break
+                        # If line is indented (starts with space) and contains usage-like chars, it's a continuation
+                        if window[j].startswith(' ') and any(c in next_stripped for c in ['<', '>', '[', ']', '-', '|']):
+                            usage_parts.append(next_stripped)
+                        else:
+                            break
+                    return ' '.join(usage_parts)
+            # Otherwise, look for the next non-empty line (multi-line format like "USAGE\n  command args")
+            for j in range(1, min(6, len(window))):  # Look ahead up to 6 lines
+                next_line = stripped[j]
+                if next_line and not next_line.upper().startswith(_SECTION_HEADERS):
+                    # Collect continuation lines
+                    usage_parts = [next_line]
+                    for k in range(j + 1, min(j + 5, len(window))):
+                        cont_stripped = stripped[k]
+                        if not cont_stripped:
+                            break
+                        if window[k].startswith(' ') and any(c in cont_stripped for c in ['<', '>', '[', ']', '-', '|']):
+                            usage_parts.append(cont_stripped)
+                        else:
+                            break
+                    return ' '.join(usage_parts)
+            # If no next line found, return the header line itself
+            return line_stripped
+        return None
+    
     def _extract_options(self, help_text: str) -> List[OptionSpec]:
         """Extract options from help text."""
+        return self._options_from_lines(help_text.split('\n'))
+    
+    def _options_from_lines(self, lines: List[str]) -> List[OptionSpec]:
+        """Parse option definitions out of help text lines."""
+        # Per-line hooks are bound to locals once per call
         options = []
-        lines = help_text.split('\n')
+        append = options.append
+        is_option_line = self._is_option_line
+        parse_option_line = self._parse_option_line
         
+        # Candidate lines are picked per line by their first character, not
+        # by one multiline regex over the whole text
+        lead_chars = self._MAYBE_OPTION_FIRSTCHARS
         for line in lines:
-            line = line.strip()
-            if self._is_option_line(line):
-                option = self._parse_option_line(line)
+            if lead_chars is not None:
+                # Blank lines and unindented prose are rejected before any
+                # stripped copy of the line is made
+                if not line or (line[0] not in lead_chars and not line[0].isspace()):
+                    continue
+                line = line.lstrip()
+                if not line or line[0] not in lead_chars:
+                    continue
+                line = line.rstrip()
+            else:
+                line = line.strip()
+            if is_option_line(line):
+                option = parse_option_line(line)
                 if option:
-                    options.append(option)
+                    append(option)
         
         return options
     
-    def _extract_positional_args(self, usage: str) -> List[PositionalArgSpec]:
-        """Extract positional arguments from usage line."""
-        if not usage:
-            return []
+    def _extract_description(self, help_text: str, lines: Optional[List[str]] = None) -> str:
+        """Extract command description from help text (optionally pre-split into lines)."""
+        # If help text contains error messages, return empty description
+        if any(error_msg in help_text for error_msg in [
+            "Failed to get help", "Help command timed out", "No help available"
+        ]):
+            return ""
         
-        # Remove command name and options from usage line
-        # Example: "cp [OPTION]... [-T] SOURCE DEST" -> "SOURCE DEST"
-        usage_clean = usage.lower()
+        if lines is None:
+            lines = help_text.split('\n')
         
-        # Find the command name and remove it
-        # Skip "Usage:" prefix if present
-        usage_clean = re.sub(r'^usage:\s*', '', usage_clean, flags=re.IGNORECASE)
+        description = self._extract_name_section(help_text, lines)
+        if description is not None:
+            return description
         
-        command_match = re.search(r'^(\w+)', usage_clean)
-        if command_match:
-            command_name = command_match.group(1)
-            usage_clean = usage_clean.replace(command_name, '', 1)
+        # Fallback: Look for description in first few lines
+        for line in islice(lines, self._DESCRIPTION_LINES):
+            line = line.strip()
+            if line and not line.startswith(self._SKIP_PREFIXES):
+                return line
         
-        # Remove option patterns more comprehensively
-        # Handle complex patterns like [-v | --version], [-C <path>], etc.
-        # First, remove all bracketed option patterns (they're all optional flags)
-        # Match patterns like: [-v | --version], [-C <path>], [--exec-path[=<path>]], etc.
-        option_patterns = [
-            r'\[-?\w+\s*\|\s*--?\w+\]',  # [-v | --version] or similar
-            r'\[-?\w+\s*\|\s*--?\w+\s*\|\s*--?\w+\s*\|\s*--?\w+\]',  # [-p | --paginate | -P | --no-pager]
-            r'\[-?\w+\s*\|\s*--?\w+\s*\|\s*--?\w+\]',  # Shorter version
-            r'\[--?\w+\[?=?\s*<\w+>\]?\]',  # [--exec-path[=<path>]] or [--git-dir=<path>]
-            r'\[--?\w+\]',  # [--html-path], [--bare], etc.
-            r'\[-?\w+\s*=\s*<\w+>\]',  # [-c <name>=<value>]
-            r'\[-?\w+\s*<\w+>\]',  # [-C <path>]
-            r'\[option\]\.\.\.',
-            r'\[option\]',
-            r'\[flags?\]',  # Match [flags] or [flag]
-            r'\[flag\]',
-            r'\[-t\]',
-            r'\[-h\]',
-            r'\[-l\]',
-            r'\[-p\]',
-            r'\[-o\w*\]',
-            r'\[-d\w*\]',
-            r'\[-d\s+\w+\]',
-            r'\[-olevel\]',
-            r'\[-d\s+debugopts\]',
-        ]
-        
-        for pattern in option_patterns:
-            usage_clean = re.sub(pattern, '', usage_clean, flags=re.IGNORECASE)
-        
-        # Remove pipe characters and other separators
-        usage_clean = re.sub(r'\s*\|\s*', ' ', usage_clean)
-        
-        # Clean up extra spaces and empty parts
-        usage_clean = re.sub(r'\s+', ' ', usage_clean).strip()
+        return ""
+    
+    def _extract_name_section(self, help_text: str, lines: List[str]) -> Optional[str]:
+        """Extract the description from a man page NAME section; None if not found."""
+        return None
+    
+    def _extract_examples(self, help_text: str, lines: Optional[List[str]] = None) -> List[str]:
+        """Extract examples from help text (optionally pre-split into lines)."""
+        examples = []
+        if lines is None:
+            lines = help_text.split('\n')
+        skip_prefixes = self._SKIP_PREFIXES
+        in_examples = False
+        
+        for line in lines:
+            line = line.strip()
+            if _EXAMPLE_RE.search(line):
+                in_examples = True
+                continue
+            
+            if in_examples:
+                if line.startswith(skip_prefixes):
+                    break
+                if line:
+                    examples.append(line)
+        
+        return examples
+    
+    def _extract_positional_args(self, usage: str) -> List[PositionalArgSpec]:
+        """Extract positional arguments from usage line."""
+        # Sibling subcommands repeat the same usage line; PositionalArgSpec is
+        # immutable, so parsed results are shared between them
+        cached = self._positional_args_cache.get(usage)
+        if cached is None:
+            cached = tuple(self._parse_positional_args(usage))
+            if len(self._positional_args_cache) >= _POSITIONAL_CACHE_SIZE:
+                self._positional_args_cache.clear()
+            self._positional_args_cache[usage] = cached
+        return list(cached)
+    
+    def _parse_positional_args(self, usage: str) -> List[PositionalArgSpec]:
+        """Parse positional arguments from usage line (uncached)."""
+        if not usage:
+            return []
         
         # Special handling for git-like commands: look for <command> and [<args>] patterns
         # These are common patterns in hierarchical commands
-        # Check in the original usage string (before cleaning) to preserve patterns
+        # Check in the original usage string, before any cleanup work is done
         original_usage = usage.lower()
         
         args = []
         
+        # Scan once for <command> <subcommand>, <command> and <args> placeholders
+        tags = set()
+        for match in _TAG_RE.finditer(original_usage):
+            tags.add(match.lastgroup)
+            if match.lastgroup == 'cmd_sub':
+                break
+        
         # Check for gh-like pattern: <command> <subcommand> [flags]
-        # Must check BEFORE checking for just <command> to avoid false matches
-        if re.search(r'<command>\s+<subcommand>', original_usage, re.IGNORECASE):
+        if 'cmd_sub' in tags:
             args.append(PositionalArgSpec(
                 name="COMMAND",
                 required=True,
@@ -246,7 +1023,7 @@ class BaseParser(ABC):
             return args
         
         # Check for <command> pattern (required positional) - for git-like commands
-        if re.search(r'<command>', original_usage, re.IGNORECASE):
+        if 'cmd' in tags:
             args.append(PositionalArgSpec(
                 name="COMMAND",
                 required=True,
@@ -255,7 +1032,7 @@ class BaseParser(ABC):
             ))
         
         # Check for [<args>] or <args>... pattern (optional variadic)
-        if re.search(r'\[<args>\]|\[<args>\.\.\.\]|<args>\.\.\.', original_usage, re.IGNORECASE):
+        if 'args' in tags:
             args.append(PositionalArgSpec(
                 name="ARGS",
                 required=False,
@@ -267,38 +1044,44 @@ class BaseParser(ABC):
         if args:
             return args
         
-        if not usage_clean:
+        # Remove command name and options from usage line
+        # Example: "cp [OPTION]... [-T] SOURCE DEST" -> "SOURCE DEST"
+        # Skip "Usage:" prefix if present
+        usage_clean = original_usage
+        if usage_clean.startswith('usage:'):
+            usage_clean = usage_clean[6:].lstrip()
+        
+        # Find the command name (the leading run of word characters) and remove it
+        usage_clean = usage_clean[_word_prefix_length(usage_clean):]
+        
+        # Remove option patterns more comprehensively
+        # Handle complex patterns like [-v | --version], [-C <path>], etc.
+        # First, remove all bracketed option patterns (they're all optional flags)
+        # Match patterns like: [-v | --version], [-C <path>], [--exec-path[=<path>]], etc.
+        usage_clean = _OPTION_STRIP_RE.sub('', usage_clean)
+        
+        # Pipes separate alternatives; split on them like whitespace
+        parts = usage_clean.replace('|', ' ').split()
+        if not parts:
             return []
         
         # Parse positional arguments
-        parts = usage_clean.split()
-        
+        append = args.append
+        infer_type = self._infer_positional_type
         for part in parts:
-            part = part.strip()
-            if not part or part == ':':
-                continue
-            
-            # Skip pipe characters and other separators
-            if part in ['|', '||', '&&', '=', '==']:
-                continue
-            
-            # Skip parts that look like options (start with - or --)
-            if part.startswith('-') or part.startswith('--'):
+            # Skip separators, options (start with - or --) and single
+            # characters, which are never argument names
+            if part in _SEPARATOR_TOKENS or part[0] == '-' or len(part) == 1:
                 continue
             
             # Skip parts that contain equals (likely option values like name=value)
-            if '=' in part and not part.startswith('<'):
+            if '=' in part and part[0] != '<':
                 continue
             
-            # Skip single character parts that are likely separators
-            if len(part) == 1 and part not in ['<', '>']:
-                continue
-            
-            # Determine if argument is required (not in brackets)
-            required = not (part.startswith('[') and part.endswith(']'))
-            
-            # Remove brackets if present
-            if part.startswith('[') and part.endswith(']'):
+            # Determine if argument is required (not in brackets) and remove brackets
+            required = True
+            if part[0] == '[' and part[-1] == ']':
+                required = False
                 part = part[1:-1]
             
             # Check if variadic (ends with ...)
@@ -306,50 +1089,37 @@ class BaseParser(ABC):
             if variadic:
                 part = part[:-3]
             
-            # Skip empty parts
-            if not part:
-                continue
-            
-            # Skip if it's just angle brackets without content
-            if part in ['<', '>', '<>']:
-                continue
-            
             # Clean up angle bracket notation: <command> -> command, <args> -> args
-            if part.startswith('<') and part.endswith('>'):
+            if part[:1] == '<' and part[-1:] == '>':
                 part = part[1:-1]
             
-            # Skip if still empty or too short
-            if not part or len(part) < 2:
-                continue
-            
-            # Skip if it contains invalid characters (like brackets, pipes, etc.)
-            if any(c in part for c in ['[', ']', '|', '=', '-']):
+            # Skip if empty, too short, or it contains invalid characters
+            # (like brackets, pipes, etc.)
+            if len(part) < 2 or not _INVALID_CHARS.isdisjoint(part):
                 continue
             
-            # Infer type hint
-            type_hint = self._infer_positional_type(part)
-            
-            args.append(PositionalArgSpec(
+            append(PositionalArgSpec(
                 name=part.upper(),
                 required=required,
                 variadic=variadic,
-                type_hint=type_hint
+                type_hint=infer_type(part)
             ))
         
         return args
     
     def _infer_positional_type(self, arg_name: str) -> str:
         """Infer type hint for positional argument."""
-        arg_lower = arg_name.lower()
+        hits = set()
+        for match in _POSITIONAL_TYPE_RE.finditer(arg_name.lower()):
+            hit = match.lastgroup
+            if hit == 'path':
+                return 'path'
+            hits.add(hit)
         
-        if any(word in arg_lower for word in ['file', 'path', 'directory', 'dir', 'source', 'dest', 'target']):
-            return 'path'
-        elif any(word in arg_lower for word in ['pattern', 'string', 'text', 'name']):
-            return 'str'
-        elif any(word in arg_lower for word in ['number', 'count', 'size', 'port']):
+        # A string keyword outranks a numeric one ("name size" stays a str)
+        if 'int' in hits and 'str' not in hits:
             return 'int'
-        else:
-            return 'str'
+        return 'str'
     
     @abstractmethod
     def _is_option_line(self, line: str) -> bool:
@@ -361,18 +1131,27 @@ class BaseParser(ABC):
         """Parse a single option line."""
         pass
     
-    def _infer_type_hint(self, description: str) -> Optional[str]:
-        """Infer type hint from option description."""
+    def _infer_type_hint(self, description: str, description_lower: Optional[str] = None) -> Optional[str]:
+        """Infer type hint from option description (description_lower: its lowercase form, if already computed)."""
         if not description:
             return None
-            
-        description_lower = description.lower()
+        if description_lower is None:
+            description_lower = description.lower()
+        
+        # Priority is path > int > bool > str; path can return immediately
+        found_int = found_bool = False
+        for match in _OPTION_TYPE_RE.finditer(description_lower):
+            hit = match.lastgroup
+            if hit == 'path':
+                return 'path'
+            if hit == 'int':
+                found_int = True
+            elif hit == 'bool':
+                found_bool = True
         
-        if any(word in description_lower for word in ['file', 'path', 'directory']):
-            return 'path'
-        elif any(word in description_lower for word in ['number', 'count', 'size']):
+        if found_int:
             return 'int'
-        elif any(word in description_lower for word in ['verbose', 'quiet', 'debug']):
+        elif found_bool:
             return 'bool'
         else:
             return 'str'
@@ -5,19 +5,46 @@ This module handles parsing of Linux/Unix command help text (--help and man page
 and extracting command specifications.
 """
 
+import asyncio
 import re
 import subprocess
+import sys
 from typing import List, Optional
 
-from .base import BaseParser
+from .base import BaseParser, _ASCII_LETTERS, _SENTINEL_PREFIXES, _decode_output
 from models import CommandSpec, OptionSpec
 
 
+# Option line formats, tried left to right in a single match, most specific
+# first. The description group closes last in each alternative, so
+# match.lastgroup names the format that matched.
+_OPTION_RE = re.compile(
+    r'^\s*(?:'
+    # Complex option with brackets: -c[:<stream_spec>] <codec>    description
+    r'(?P<bracket_flag>-[a-zA-Z])(?:\[[^\]]*\])?\s*<\w+>\s*(?P<bracket>.*)'
+    # Long option with equals: --block-size=SIZE    description
+    r'|(?P<equals_flag>--[a-zA-Z][a-zA-Z0-9-]*)=\w+\s*(?P<equals>.*)'
+    # Short and long options: -a, --all    description
+    r'|(?P<short_flag>-[a-zA-Z])(?:,\s*(?P<short_long>--[a-zA-Z][a-zA-Z0-9-]*))?\s*(?P<short>.*)'
+    # Long option only: --all    description
+    r'|(?P<long_flag>--[a-zA-Z][a-zA-Z0-9-]*)\s*(?P<long>.*)'
+    r')'
+)
+
+# Description group -> flag group for the single-flag formats above
+_FLAG_GROUPS = {form: form + '_flag' for form in ('bracket', 'equals', 'long')}
+
+# Description words suggesting the option takes a value, matched anywhere
+# ("ARGUMENTS", "WORDS" count too) in one scan of the lowercased description
+_VALUE_HINT_RE = re.compile(r'arg|size|word|cols|pattern|when')
+
+
 class PosixParser(BaseParser):
     """Parser for POSIX command help text."""
     
-    def __init__(self, timeout: int = 10):
-        super().__init__(timeout)
+    _MAYBE_OPTION_FIRSTCHARS = frozenset('-')
+    _SKIP_PREFIXES = ('Usage:', 'SYNOPSIS:', '-', 'Options:')
+    _DESCRIPTION_LINES = 10
     
     def _get_help_command(self, command_name: str) -> List[str]:
         """Get POSIX help command."""
@@ -29,12 +56,12 @@ class PosixParser(BaseParser):
         try:
             result = subprocess.run(
                 ['man', command_name],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 timeout=self.timeout
             )
             if result.returncode == 0:
-                return result.stdout
+                return _decode_output(result.stdout)
         except:
             pass
         
@@ -42,39 +69,74 @@ class PosixParser(BaseParser):
         try:
             result = subprocess.run(
                 [command_name, '-h'],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 timeout=self.timeout
             )
             if result.returncode == 0:
-                return result.stdout
+                return _decode_output(result.stdout)
         except:
             pass
         
         return None
     
+    async def _try_alternative_help_async(self, command_name: str) -> Optional[str]:
+        """Try alternative help methods for POSIX on asyncio subprocesses."""
+        # Same order as _try_alternative_help: man page, then -h
+        for cmd in (['man', command_name], [command_name, '-h']):
+            proc = None
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=self.timeout)
+                if proc.returncode == 0:
+                    return _decode_output(stdout)
+            except Exception:
+                # Missing command, timeout or I/O error: try the next method
+                pass
+            finally:
+                # Also reached on cancellation, so no man or -h child outlives
+                # a cancelled batch
+                if proc is not None and proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
+        
+        return None
+    
     def _parse_help_text(self, command_name: str, help_text: str) -> CommandSpec:
         """Parse POSIX help text into CommandSpec."""
-        usage = self._extract_usage(help_text)
-        options = self._extract_options(help_text)
-        positional_args = self._extract_positional_args(usage)
-        description = self._extract_description(help_text)
-        examples = self._extract_examples(help_text)
+        if help_text.startswith(_SENTINEL_PREFIXES):
+            # A failed lookup message; every extractor would come back empty
+            return self._failed_lookup_spec(command_name)
+        
+        # Split once; every extractor below walks the same list of lines
+        lines = help_text.split('\n')
+        usage, options, positional_args = self._scan_help_text(help_text, lines)
+        description = self._extract_description(help_text, lines)
+        examples = self._extract_examples(help_text, lines)
         
         return CommandSpec(
             name=command_name,
             usage=usage,
             options=options,
-            positional_args=positional_args,
+            positional_args=tuple(positional_args),
             description=description,
-            examples=examples
+            examples=tuple(examples)
         )
     
     def _is_option_line(self, line: str) -> bool:
         """Check if a line contains a POSIX option definition."""
         # POSIX options typically start with - or --
         # Handle both short options (-a) and long options (--all)
-        return bool(re.match(r'^\s*-[a-zA-Z]', line) or re.match(r'^\s*--[a-zA-Z]', line))
+        stripped = line.lstrip()
+        if stripped[:1] != '-':
+            return False
+        if stripped[1:2] == '-':
+            return stripped[2:3] in _ASCII_LETTERS
+        return stripped[1:2] in _ASCII_LETTERS
     
     def _parse_option_line(self, line: str) -> Optional[OptionSpec]:
         """Parse a POSIX option line with enhanced patterns for complex formats."""
@@ -86,63 +148,45 @@ class PosixParser(BaseParser):
         # -c[:<stream_spec>] <codec>    Description text (complex format)
         # --format-sort SORTORDER    Description text (complex format)
         
-        # More comprehensive regex to handle various option formats
-        patterns = [
-            # Complex option with brackets: -c[:<stream_spec>] <codec>    description
-            r'^\s*(-[a-zA-Z])(?:\[[^\]]*\])?\s*<(\w+)>\s*(.*)',
-            # Long option with equals: --block-size=SIZE    description (most specific first)
-            r'^\s*(--[a-zA-Z][a-zA-Z0-9-]*)=(\w+)\s*(.*)',
-            # Short and long options: -a, --all    description
-            r'^\s*(-[a-zA-Z])(?:,\s*(--[a-zA-Z][a-zA-Z0-9-]*))?\s*(.*)',
-            # Long option only: --all    description
-            r'^\s*(--[a-zA-Z][a-zA-Z0-9-]*)\s*(.*)',
-        ]
+        match = _OPTION_RE.match(line)
+        if match is None:
+            return None
         
-        for pattern in patterns:
-            match = re.match(pattern, line)
-            if match:
-                groups = match.groups()
-                if len(groups) == 3:  # Short and long options or option with value
-                    if groups[1] and ('=' in line or '<' in line):  # Option with value like --width=COLS or -c <codec>
-                        primary_flag, value, description = groups
-                    else:  # Short and long options
-                        short_flag, long_flag, description = groups
-                        primary_flag = long_flag if long_flag else short_flag
-                elif len(groups) == 2:  # Long option only
-                    primary_flag, description = groups
-                else:
-                    continue
-                
-                # Handle empty description
-                if not description:
-                    description = ""
-                
-                # Determine if it takes a value
-                takes_value = '=' in line or any(word in description.upper() for word in ['ARG', 'SIZE', 'WORD', 'COLS', 'PATTERN', 'WHEN'])
-                
-                # Infer type hint
-                type_hint = self._infer_type_hint(description)
-                
-                return OptionSpec(
-                    flag=primary_flag,
-                    takes_value=takes_value,
-                    description=description.strip(),
-                    type_hint=type_hint
-                )
+        # One group() call per line fetches the description and its flags
+        form = match.lastgroup
+        if form == 'short':
+            description, short_flag, long_flag = match.group(form, 'short_flag', 'short_long')
+            if long_flag and ('=' in line or '<' in line):
+                # "-w, --width=COLS" is reported under its short flag
+                primary_flag = short_flag
+            else:
+                primary_flag = long_flag or short_flag
+        else:
+            description, primary_flag = match.group(form, _FLAG_GROUPS[form])
         
-        return None
-    
-    def _extract_description(self, help_text: str) -> str:
-        """Extract command description from help text."""
-        # If help text contains error messages, return empty description
-        if any(error_msg in help_text for error_msg in [
-            "Failed to get help", "Help command timed out", "No help available"
-        ]):
-            return ""
+        # Lowercased once for both the value probe and type inference
+        description_lower = description.lower()
         
-        lines = help_text.split('\n')
+        # Determine if it takes a value
+        takes_value = '=' in line or _VALUE_HINT_RE.search(description_lower) is not None
+        
+        # Infer type hint
+        type_hint = self._infer_type_hint(description, description_lower)
+        
+        return OptionSpec(
+            flag=sys.intern(primary_flag),
+            takes_value=takes_value,
+            description=description.strip(),
+            type_hint=type_hint
+        )
+    
+    def _extract_name_section(self, help_text: str, lines: List[str]) -> Optional[str]:
+        """Extract the description from a man page NAME section, if there is one."""
+        # Plain --help output has no NAME heading, so it skips this scan of
+        # every line
+        if 'NAME' not in help_text:
+            return None
         
-        # Look for NAME section first (man page format)
         in_name_section = False
         for line in lines:
             line = line.strip()
@@ -158,29 +202,4 @@ class PosixParser(BaseParser):
             elif in_name_section and line.startswith(('SYNOPSIS', 'DESCRIPTION', 'OPTIONS')):
                 break
         
-        # Fallback: Look for description in first few lines
-        for line in lines[:10]:
-            line = line.strip()
-            if line and not line.startswith(('Usage:', 'SYNOPSIS:', '-', 'Options:')):
-                return line
-        
-        return ""
-    
-    def _extract_examples(self, help_text: str) -> List[str]:
-        """Extract examples from help text."""
-        examples = []
-        lines = help_text.split('\n')
-        in_examples = False
-        
-        for line in lines:
-            line = line.strip()
-            if 'example' in line.lower():
-                in_examples = True
-                continue
-            
-            if in_examples and line and not line.startswith(('Usage:', 'SYNOPSIS:', '-', 'Options:')):
-                examples.append(line)
-            elif in_examples and line.startswith(('Usage:', 'SYNOPSIS:', '-', 'Options:')):
-                break
-        
-        return examples
+        return None
@@ -0,0 +1,110 @@
+"""
+Shared pytest fixtures for UCW tests.
+
+Fixtures here replace real process spawns in tests that only need a
+plausible subprocess result, keeping the suite independent of the host's
+commands and free of per-test fork/exec cost.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Make the plugin root importable once for the whole session. Test modules
+# keep their own insert so they can still be run directly as scripts.
+_ROOT = str(Path(__file__).parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+
+@pytest.fixture(autouse=True)
+def isolated_ucw_cache(tmp_path_factory, monkeypatch):
+    """
+    Keep every test's spec and parser caches away from the user's cache.
+    
+    Tests feed canned help text through the cached parse paths; written to
+    the real cache directory, those fake specs would be served for the real
+    executables afterwards. Each test gets a fresh directory and starts and
+    ends with empty in-process caches.
+    """
+    import __init__ as ucw_module
+    from parser.base import BaseParser
+    
+    monkeypatch.setenv('UCW_CACHE_DIR', str(tmp_path_factory.mktemp("ucw-cache")))
+    monkeypatch.delenv('UCW_CACHE_DISABLE', raising=False)
+    ucw_module._SPEC_MEMO.clear()
+    BaseParser.clear_help_cache()
+    yield
+    ucw_module._SPEC_MEMO.clear()
+    BaseParser.clear_help_cache()
+
+
+@pytest.fixture(scope="module")
+def mocked_subprocess():
+    """
+    Patch subprocess.run for the rest of the module with a canned result.
+    
+    The mock reports a successful run with empty text output, which is what
+    CommandWrapper.run expects; tests may reconfigure it but should not rely
+    on call history left by earlier tests in the module.
+    """
+    mock_run = MagicMock(
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout="", stderr="")
+    )
+    with patch('subprocess.run', mock_run):
+        yield mock_run
+
+
+@pytest.fixture(scope="session")
+def ucw():
+    """One auto-detected UniversalCommandWrapper shared by the whole session."""
+    from __init__ import UniversalCommandWrapper
+    return UniversalCommandWrapper()
+
+
+@pytest.fixture(scope="session")
+def parsed_spec(ucw):
+    """
+    Look up CommandSpecs, parsing each command at most once per session.
+    
+    Returns a function taking a command name, so tests that share a
+    command (e.g. several README examples using echo) share one parse.
+    """
+    specs = {}
+    
+    def lookup(command_name):
+        if command_name not in specs:
+            specs[command_name] = ucw.parse_command(command_name)
+        return specs[command_name]
+    
+    return lookup
+
+
+@pytest.fixture
+def make_wrapper():
+    """
+    Build a CommandWrapper from compact option and positional definitions.
+    
+    The returned function takes a command name, (flag, takes_value) pairs
+    and optionally the names of required positional arguments.
+    """
+    from models import CommandSpec, OptionSpec, PositionalArgSpec
+    from wrapper import CommandWrapper
+    
+    def build(name, flags, positional=()):
+        spec = CommandSpec(
+            name=name,
+            usage=f"{name} [options]",
+            options=[OptionSpec(flag=flag, takes_value=takes_value, description="")
+                     for flag, takes_value in flags],
+            positional_args=[PositionalArgSpec(name=arg, required=True, variadic=False, description="")
+                             for arg in positional],
+            description="",
+            examples=[]
+        )
+        return CommandWrapper(name, spec)
+    
+    return build
@@ -5,8 +5,10 @@ This module tests that generated plugin code uses correct argparse attribute nam
 """
 
 import pytest
+import re
 import sys
 from pathlib import Path
+from unittest.mock import patch
 
 # Add the parent directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -14,6 +16,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from generator.wrapper_builder import WrapperBuilder
 from models import CommandSpec, OptionSpec
 
+_DEST_RE = re.compile(r'dest="([^"]+)"')
+
+
+def _extract_dests(code: str) -> set:
+    """Collect every argparse dest in generated code in a single pass."""
+    return set(_DEST_RE.findall(code))
+
 
 class TestArgparseAttributeNames:
     """Test cases for argparse attribute name generation."""
@@ -103,9 +112,7 @@ class TestArgparseAttributeNames:
         assert 'args._output' not in code
         
         # Should use dest parameter in argument definitions
-        assert 'dest="all"' in code
-        assert 'dest="l"' in code
-        assert 'dest="output"' in code
+        assert {'all', 'l', 'output'} <= _extract_dests(code)
     
     def test_windows_flag_normalization(self):
         """Test that Windows flags like /? are handled correctly."""
@@ -125,8 +132,7 @@ class TestArgparseAttributeNames:
         code = builder.generate_mcp_plugin_code(spec)
         
         # Should normalize Windows flags properly
-        assert 'dest="question"' in code
-        assert 'dest="help"' in code
+        assert {'question', 'help'} <= _extract_dests(code)
         assert 'args.question' in code
         assert 'args.help' in code
     
@@ -150,15 +156,39 @@ class TestArgparseAttributeNames:
         code = builder.generate_mcp_plugin_code(spec)
         
         # Should handle complex flag names correctly
-        assert 'dest="long_option"' in code
-        assert 'dest="with_dashes"' in code
-        assert 'dest="a"' in code
-        assert 'dest="z"' in code
+        assert {'long_option', 'with_dashes', 'a', 'z'} <= _extract_dests(code)
         
         assert 'args.long_option' in code
         assert 'args.with_dashes' in code
         assert 'args.a' in code
         assert 'args.z' in code
+    
+    def test_generated_plugin_code_is_memoized(self):
+        """Test that identical specs reuse generated code and the timeout is part of the key."""
+        spec = CommandSpec(
+            name="memocmd",
+            usage="memocmd [options]",
+            options=[OptionSpec(flag="--all", takes_value=False, description="Show all")],
+            description="Test command",
+            examples=[]
+        )
+        same_spec = CommandSpec(
+            name="memocmd",
+            usage="memocmd [options]",
+            options=[OptionSpec(flag="--all", takes_value=False, description="Show all")],
+            description="Test command",
+            examples=[]
+        )
+        
+        first = WrapperBuilder().generate_mcp_plugin_code(spec)
+        with patch.object(WrapperBuilder, '_render_plugin_code') as mock_render:
+            second = WrapperBuilder().generate_mcp_plugin_code(same_spec)
+        mock_render.assert_not_called()
+        assert second == first
+        
+        slower = WrapperBuilder(timeout_exec=99).generate_mcp_plugin_code(spec)
+        assert "timeout=99" in slower
+        assert "timeout=99" not in first
 
 
 if __name__ == "__main__":
@@ -4,18 +4,40 @@ Unit tests for base parser.
 This module tests the BaseParser abstract base class functionality.
 """
 
+import asyncio
+import os
 import pytest
+import queue
 import subprocess
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import sys
 from pathlib import Path
 
 # Add the parent directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from parser.base import BaseParser
+from parser.base import BaseParser, _ShellWorker, _MAX_HELP_BYTES
 from models import CommandSpec, OptionSpec
 
+# Help output served for sys.executable by the subprocess fakes below
+PYTHON_HELP = b"usage: python [option] ... [-c cmd | -m mod | file | -] [arg] ..."
+
+
+def _fake_run(cmd, **kwargs):
+    """subprocess.run stand-in: help for sys.executable, missing command otherwise."""
+    if cmd[0] != sys.executable:
+        raise FileNotFoundError(cmd[0])
+    return MagicMock(returncode=0, stdout=PYTHON_HELP, stderr=b"")
+
+
+async def _fake_exec(*cmd, **kwargs):
+    """asyncio.create_subprocess_exec stand-in matching _fake_run."""
+    if cmd[0] != sys.executable:
+        raise FileNotFoundError(cmd[0])
+    proc = MagicMock(returncode=0)
+    proc.communicate = AsyncMock(return_value=(PYTHON_HELP, None))
+    return proc
+
 
 class ConcreteParser(BaseParser):
     """Concrete implementation of BaseParser for testing."""
@@ -80,7 +102,7 @@ Options:
         with patch('subprocess.run') as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=0,
-                stdout=mock_output,
+                stdout=mock_output.encode(),
                 stderr=""
             )
             
@@ -88,8 +110,8 @@ Options:
             assert result == mock_output
             mock_run.assert_called_once_with(
                 ["testcmd", "--help"],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 shell=False,
                 timeout=10
             )
@@ -101,8 +123,8 @@ Options:
         with patch('subprocess.run') as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=1,
-                stdout="",
-                stderr="Command not found"
+                stdout=b"",
+                stderr=b"Command not found"
             )
             
             result = parser._get_help_text("nonexistent")
@@ -120,6 +142,59 @@ Options:
             # Should return timeout error message
             assert result == "Help command timed out for testcmd"
     
+    def test_get_help_text_decodes_bytes(self):
+        """Test that raw help output is decoded once with newlines normalized."""
+        parser = ConcreteParser()
+        
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0,
+                stdout=b"Usage: testcmd [options]\r\n  --test     Caf\xe9 option\r\n",
+                stderr=b""
+            )
+            
+            result = parser._get_help_text("testcmd")
+            assert result == "Usage: testcmd [options]\n  --test     Caf\ufffd option\n"
+    
+    def test_get_help_text_truncates_huge_output(self):
+        """Test that help output past _MAX_HELP_BYTES is dropped before decoding."""
+        parser = ConcreteParser()
+        
+        with patch('subprocess.run') as mock_run:
+            mock_run.return_value = MagicMock(
+                returncode=0,
+                stdout=b"Usage: testcmd\n" + b"x" * (2 * _MAX_HELP_BYTES),
+                stderr=b""
+            )
+            
+            result = parser._get_help_text("testcmd")
+            assert result.startswith("Usage: testcmd\n")
+            assert len(result) == _MAX_HELP_BYTES
+    
+    def test_get_help_text_is_memoized(self):
+        """Test that help text for an executable on PATH is fetched once."""
+        parser = ConcreteParser()
+        BaseParser.clear_help_cache()
+        
+        try:
+            with patch('subprocess.run') as mock_run:
+                mock_run.return_value = MagicMock(
+                    returncode=0,
+                    stdout=b"Usage: python [option] ... [-c cmd | file] [arg] ...",
+                    stderr=b""
+                )
+                
+                first = parser._get_help_text(sys.executable)
+                second = ConcreteParser()._get_help_text(sys.executable)
+                assert first == second
+                assert mock_run.call_count == 1
+                
+                BaseParser.clear_help_cache()
+                parser._get_help_text(sys.executable)
+                assert mock_run.call_count == 2
+        finally:
+            BaseParser.clear_help_cache()
+    
     def test_get_help_text_exception(self):
         """Test _get_help_text with exception."""
         parser = ConcreteParser()
@@ -162,6 +237,19 @@ Options:
             assert spec.description == "Test command"
             assert len(spec.options) == 1  # Still gets the test option from mock
     
+    def test_parse_command_failed_lookup_skips_parsing(self):
+        """Test that failed help lookups return an empty spec without parsing."""
+        parser = ConcreteParser()
+        
+        with patch.object(parser, '_get_help_text', return_value="Help command timed out for testcmd"), \
+                patch.object(parser, '_parse_help_text') as mock_parse:
+            spec = parser.parse_command("testcmd")
+        
+        mock_parse.assert_not_called()
+        assert spec.name == "testcmd"
+        assert spec.usage == ""
+        assert len(spec.options) == 0
+    
     def test_abstract_methods(self):
         """Test that abstract methods raise NotImplementedError."""
         # Test that we can't instantiate BaseParser directly
@@ -175,8 +263,8 @@ Options:
         with patch('subprocess.run') as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=0,
-                stdout="test output",
-                stderr=""
+                stdout=b"test output",
+                stderr=b""
             )
             
             parser._get_help_text("testcmd")
@@ -184,8 +272,8 @@ Options:
             # Check that timeout was passed correctly
             mock_run.assert_called_once_with(
                 ["testcmd", "--help"],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 shell=False,
                 timeout=30
             )
@@ -197,8 +285,8 @@ Options:
         with patch('subprocess.run') as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=0,
-                stdout="test output",
-                stderr=""
+                stdout=b"test output",
+                stderr=b""
             )
             
             parser._get_help_text("testcmd")
@@ -210,7 +298,245 @@ Options:
             # Check that command is passed as list, not string
             assert isinstance(call_args.args[0], list)
             assert call_args.args[0] == ["testcmd", "--help"]
+    
+    def test_parse_commands_preserves_order(self):
+        """Test that the async batch API returns one spec per name, in order."""
+        parser = ConcreteParser()
+        BaseParser.clear_help_cache()
+        names = [sys.executable, "nonexistent_command_12345", ""]
+        
+        try:
+            with patch('asyncio.create_subprocess_exec', _fake_exec):
+                specs = asyncio.run(parser.parse_commands(names))
+        finally:
+            BaseParser.clear_help_cache()
+        
+        assert [spec.name for spec in specs] == [sys.executable, "nonexistent_command_12345", ""]
+    
+    def test_parse_many_preserves_order(self):
+        """Test that the thread pool batch API returns one spec per name, in order."""
+        parser = ConcreteParser()
+        BaseParser.clear_help_cache()
+        names = [sys.executable, "nonexistent_command_12345", "", sys.executable]
+        
+        try:
+            with patch('subprocess.run', side_effect=_fake_run):
+                specs = parser.parse_many(names, max_workers=2)
+        finally:
+            BaseParser.clear_help_cache()
+        
+        assert [spec.name for spec in specs] == names
+        assert parser.parse_many([]) == []
+        with pytest.raises(TypeError):
+            parser.parse_many([None])
+    
+    def test_get_help_text_async_matches_sync(self):
+        """Test that async help lookup returns the same text as the sync path."""
+        parser = ConcreteParser()
+        BaseParser.clear_help_cache()
+        
+        try:
+            with patch('asyncio.create_subprocess_exec', _fake_exec), \
+                    patch('subprocess.run', side_effect=_fake_run):
+                async_text = asyncio.run(parser._get_help_text_async(sys.executable))
+                BaseParser.clear_help_cache()
+                sync_text = parser._get_help_text(sys.executable)
+                missing = asyncio.run(parser._get_help_text_async("nonexistent_command_12345"))
+        finally:
+            BaseParser.clear_help_cache()
+        
+        assert async_text == sync_text
+        assert "usage" in async_text.lower()
+        assert missing.startswith("Failed to get help for nonexistent_command_12345")
+    
+    def test_get_help_text_async_kills_child_on_cancel(self):
+        """Test that cancelling an async help lookup kills its subprocess."""
+        parser = ConcreteParser(timeout=3600)
+        procs = []
+        
+        async def hang():
+            await asyncio.sleep(3600)
+        
+        async def fake_exec(*cmd, **kwargs):
+            proc = MagicMock(returncode=None)
+            proc.communicate = hang
+            proc.wait = AsyncMock(return_value=-9)
+            procs.append(proc)
+            return proc
+        
+        async def cancel_midway():
+            task = asyncio.ensure_future(parser._get_help_text_async("hangs"))
+            while not procs:
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        with patch('asyncio.create_subprocess_exec', fake_exec):
+            asyncio.run(cancel_midway())
+        
+        assert len(procs) == 1
+        procs[0].kill.assert_called_once()
+        procs[0].wait.assert_awaited_once()
+    
+    def test_usage_header_must_start_line(self):
+        """Test that usage keywords in the middle of prose are not headers."""
+        parser = ConcreteParser()
+        help_text = "See the usage: notes below.\nUsage: mycmd [options] FILE\n"
+        
+        assert parser._extract_usage(help_text) == "mycmd [options] FILE"
+
+    def test_usage_header_mid_line_fallback(self):
+        """Test that a mid-line usage keyword is used when no header starts a line."""
+        parser = ConcreteParser()
+        help_text = (
+            "Copyright (c) 1990-2008 Info-ZIP - Type 'zip \"-L\"' for software license.\n"
+            "Zip 3.0 (July 5th 2008). Usage:\n"
+            "zip [-options] [-b path] [-t mmddyyyy] [-n suffixes] [zipfile list] [-xi list]\n"
+            "  The default action is to add or replace zipfile entries from list, which\n"
+        )
+        expected = "zip [-options] [-b path] [-t mmddyyyy] [-n suffixes] [zipfile list] [-xi list]"
+
+        assert parser._extract_usage(help_text) == expected
+        assert parser._find_usage(help_text, help_text.split('\n')) == expected
+
+    def test_infer_type_hint_matches_whole_words(self):
+        """Test that option type inference matches words, not substrings."""
+        parser = ConcreteParser()
+        
+        assert parser._infer_type_hint("read input from FILE") == 'path'
+        assert parser._infer_type_hint("block size of the file") == 'path'
+        assert parser._infer_type_hint("number of lines") == 'int'
+        assert parser._infer_type_hint("print debugging output") == 'bool'
+        assert parser._infer_type_hint("resize the terminal") == 'str'
+        assert parser._infer_type_hint("use RFILE's mode instead of MODE values") == 'path'
+        assert parser._infer_type_hint("ignore PYTHON* environment variables (such as PYTHONPATH)") == 'path'
+        assert parser._infer_type_hint("list verbosely/show version info") == 'bool'
+        assert parser._infer_type_hint("copy directories recursively") == 'str'
+        assert parser._infer_type_hint("mount the filesystem") == 'path'
+        assert parser._infer_type_hint("set counter value") == 'int'
+        assert parser._infer_type_hint("print numbered lines") == 'int'
+        assert parser._infer_type_hint("") is None
+    
+    def test_infer_positional_type_matches_whole_words(self):
+        """Test that positional type inference matches words, not substrings."""
+        parser = ConcreteParser()
+        
+        assert parser._infer_positional_type("SRC_FILE") == 'path'
+        assert parser._infer_positional_type("DIRS") == 'path'
+        assert parser._infer_positional_type("PORT") == 'int'
+        assert parser._infer_positional_type("NAME_SIZE") == 'str'
+        assert parser._infer_positional_type("RESIZE") == 'str'
+        assert parser._infer_positional_type("FILESYSTEM") == 'path'
+        assert parser._infer_positional_type("COUNTER") == 'int'
+
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX shell test")
+class TestShellWorker:
+    """Test cases for the persistent shell used by shell builtins."""
+    
+    def test_run_reuses_one_shell(self):
+        """Test that commands run in one shell and output is framed exactly."""
+        worker = _ShellWorker()
+        
+        try:
+            assert worker.run(["printf", "abc"], 5) == b"abc"
+            pid = worker._proc.pid
+            assert worker.run(["echo", "hello world"], 5) == b"hello world\n"
+            assert worker.run(["sh", "-c", "echo oops >&2"], 5) == b""
+            assert worker._proc.pid == pid
+        finally:
+            worker.close()
+    
+    def test_timeout_respawns_shell(self):
+        """Test that a hung command raises TimeoutExpired and the next call still works."""
+        worker = _ShellWorker()
+        
+        try:
+            with pytest.raises(subprocess.TimeoutExpired):
+                worker.run(["sleep", "5"], 0.2)
+            assert worker.run(["echo", "ok"], 5) == b"ok\n"
+        finally:
+            worker.close()
+    
+    def test_get_help_text_uses_worker_for_shell_commands(self):
+        """Test that commands needing a shell are sent to the shared worker."""
+        parser = ConcreteParser()
+        worker = MagicMock()
+        worker.run.return_value = b"Usage: dir [drive:][path][filename] [/P] [/W]"
+        
+        with patch.object(parser, '_needs_shell', return_value=True), \
+                patch('parser.base._shell_worker', return_value=worker), \
+                patch('subprocess.run') as mock_run:
+            result = parser._get_help_text("dir")
+        
+        mock_run.assert_not_called()
+        worker.run.assert_called_once_with(["dir", "--help"], 10)
+        assert result == "Usage: dir [drive:][path][filename] [/P] [/W]"
+
+
+class _FakeCmdExe:
+    """Popen stand-in that answers framed command lines the way cmd.exe does."""
+    
+    def __init__(self, help_output: bytes):
+        self.help_output = help_output
+        self.sent = []
+        self.pid = 1234
+        self._out = queue.Queue()
+        self.stdin = MagicMock()
+        self.stdin.write.side_effect = self._write
+        self.stdout = MagicMock()
+        self.stdout.readline.side_effect = self._out.get
+    
+    def _write(self, data: bytes):
+        line = data.decode('utf-8')
+        self.sent.append(line)
+        command, marker = line[:-2].rsplit('echo ', 1)
+        if command.endswith(' <NUL 2>NUL & echo. & '):
+            for out_line in self.help_output.splitlines(keepends=True):
+                self._out.put(out_line)
+            self._out.put(b"\r\n")
+        self._out.put(marker.encode('ascii') + b"\r\n")
+    
+    def poll(self):
+        return None
+    
+    def kill(self):
+        self._out.put(b'')
+    
+    def wait(self):
+        return 0
+
+
+class TestShellWorkerWindows:
+    """Test cases for the cmd.exe framing of the persistent shell."""
+    
+    def test_run_frames_commands_for_cmd_exe(self):
+        """Test that cmd.exe command lines are framed and CRLF output is cut at the marker."""
+        help_output = b"Displays a list of files and subdirectories.\r\n\r\nDIR [drive:][path][filename]\r\n"
+        fake = _FakeCmdExe(help_output)
+        worker = _ShellWorker()
+        worker._windows = True
+        worker._newline = '\r\n'
+        
+        with patch.dict(os.environ, {'COMSPEC': 'C:\\Windows\\system32\\cmd.exe'}), \
+                patch('parser.base.subprocess.Popen', return_value=fake) as mock_popen:
+            try:
+                assert worker.run(["dir", "/?"], 5) == help_output
+                assert worker.run(["dir", "/?"], 5) == help_output
+            finally:
+                worker.close()
+        
+        mock_popen.assert_called_once()
+        assert mock_popen.call_args.args[0] == ['C:\\Windows\\system32\\cmd.exe', '/D', '/Q']
+        marker = worker._marker
+        assert fake.sent == [
+            f"echo {marker}\r\n",
+            f"dir /? <NUL 2>NUL & echo. & echo {marker}\r\n",
+            f"dir /? <NUL 2>NUL & echo. & echo {marker}\r\n",
+        ]
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -15,6 +15,16 @@ from unittest.mock import patch, MagicMock
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
+@pytest.fixture(scope="module")
+def source_cache():
+    """Read the parser package sources once for every test in the module."""
+    parser_dir = Path(__file__).parent.parent / "parser"
+    return {
+        'init': (parser_dir / "__init__.py").read_text(),
+        'base': (parser_dir / "base.py").read_text(),
+    }
+
+
 class TestBaseParserImports:
     """Test cases for BaseParser import functionality and security."""
     
@@ -40,7 +50,7 @@ class TestBaseParserImports:
         assert BaseParser1 is BaseParser2
         assert BaseParser1 == BaseParser2
     
-    def test_no_duplicate_class_definition(self):
+    def test_no_duplicate_class_definition(self, source_cache):
         """Test that there's no duplicate class definition."""
         import parser
         import parser.base
@@ -49,19 +59,17 @@ class TestBaseParserImports:
         assert parser.BaseParser is parser.base.BaseParser
         
         # The __init__.py should only re-export, not define
-        init_source = Path(__file__).parent.parent / "parser" / "__init__.py"
-        init_content = init_source.read_text()
+        init_content = source_cache['init']
         
         # Should not contain class definition
         assert "class BaseParser:" not in init_content
         # Should contain import statement
         assert "from .base import BaseParser" in init_content
     
-    def test_no_shell_true_usage(self):
+    def test_no_shell_true_usage(self, source_cache):
         """Test that shell=True usage has been eliminated."""
-        # Read the base.py file to check for shell=True
-        base_source = Path(__file__).parent.parent / "parser" / "base.py"
-        base_content = base_source.read_text()
+        # Check base.py for shell=True
+        base_content = source_cache['base']
         
         # Should not contain shell=True (except for Windows-specific usage)
         # Windows parser needs shell=True for proper command execution
@@ -104,7 +112,7 @@ class TestBaseParserImports:
         with patch('subprocess.run') as mock_run:
             mock_result = MagicMock()
             mock_result.returncode = 0
-            mock_result.stdout = "test help"
+            mock_result.stdout = b"test help"
             mock_run.return_value = mock_result
             
             # This should call subprocess.run without shell=True
@@ -4,20 +4,49 @@ CLI integration tests for UCW.
 This module tests the command-line interface functionality.
 """
 
+import argparse
+import io
+import json
 import pytest
-import subprocess
 import sys
 import tempfile
 import os
 from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 # Add the parent directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from cli import main, setup_wrap_command, setup_parse_command, setup_execute_command
+from cli import main, _dumps, _print_json, setup_wrap_command, setup_parse_command, setup_execute_command
 from __init__ import UniversalCommandWrapper
 
 
+def _build_parser(setup) -> argparse.ArgumentParser:
+    """Build a top-level parser with one subcommand registered by setup."""
+    parser = argparse.ArgumentParser()
+    setup(parser.add_subparsers())
+    return parser
+
+
+@pytest.fixture(scope="module")
+def wrap_parser():
+    """Parser with the wrap subcommand, built once for the module."""
+    return _build_parser(setup_wrap_command)
+
+
+@pytest.fixture(scope="module")
+def parse_parser():
+    """Parser with the parse subcommand, built once for the module."""
+    return _build_parser(setup_parse_command)
+
+
+@pytest.fixture(scope="module")
+def execute_parser():
+    """Parser with the execute subcommand, built once for the module."""
+    return _build_parser(setup_execute_command)
+
+
 class TestCLIIntegration:
     """Test cases for CLI integration."""
     
@@ -27,76 +56,37 @@ class TestCLIIntegration:
         with pytest.raises(SystemExit):
             main()
     
-    def test_setup_wrap_command_parser(self):
-        """Test that wrap command parser is set up correctly."""
-        import argparse
-        
-        parser = argparse.ArgumentParser()
-        subparsers = parser.add_subparsers()
-        
-        setup_wrap_command(subparsers)
-        
-        # Test parsing wrap command
-        args = parser.parse_args(['wrap', 'testcmd'])
-        assert args.command_name == 'testcmd'
-        assert args.platform == 'auto'
-        assert args.timeout_help == 10
-        assert args.timeout_exec == 30
-        assert args.output is None
-        assert args.update is False
+    @pytest.mark.parametrize("argv,expected", [
+        (
+            ['wrap', 'testcmd'],
+            {'command_name': 'testcmd', 'platform': 'auto', 'timeout_help': 10,
+             'timeout_exec': 30, 'output': None, 'update': False},
+        ),
+        (
+            ['wrap', 'testcmd', '--platform', 'windows', '--timeout-help', '15',
+             '--timeout-exec', '45', '--output', 'test.py', '--update'],
+            {'command_name': 'testcmd', 'platform': 'windows', 'timeout_help': 15,
+             'timeout_exec': 45, 'output': 'test.py', 'update': True},
+        ),
+    ], ids=["defaults", "all-options"])
+    def test_setup_wrap_command_parser(self, wrap_parser, argv, expected):
+        """Test that wrap command parser is set up correctly, with and without options."""
+        args = wrap_parser.parse_args(argv)
+        for name, value in expected.items():
+            assert getattr(args, name) == value
     
-    def test_setup_wrap_command_with_options(self):
-        """Test wrap command with all options."""
-        import argparse
-        
-        parser = argparse.ArgumentParser()
-        subparsers = parser.add_subparsers()
-        
-        setup_wrap_command(subparsers)
-        
-        # Test parsing wrap command with options
-        args = parser.parse_args([
-            'wrap', 'testcmd',
-            '--platform', 'windows',
-            '--timeout-help', '15',
-            '--timeout-exec', '45',
-            '--output', 'test.py',
-            '--update'
-        ])
-        
-        assert args.command_name == 'testcmd'
-        assert args.platform == 'windows'
-        assert args.timeout_help == 15
-        assert args.timeout_exec == 45
-        assert args.output == 'test.py'
-        assert args.update is True
-    
-    def test_setup_parse_command_parser(self):
+    def test_setup_parse_command_parser(self, parse_parser):
         """Test that parse command parser is set up correctly."""
-        import argparse
-        
-        parser = argparse.ArgumentParser()
-        subparsers = parser.add_subparsers()
-        
-        setup_parse_command(subparsers)
-        
         # Test parsing parse command
-        args = parser.parse_args(['parse', 'testcmd'])
+        args = parse_parser.parse_args(['parse', 'testcmd'])
         assert args.command_name == 'testcmd'
         assert args.platform == 'auto'
         assert args.timeout_help == 10
     
-    def test_setup_execute_command_parser(self):
+    def test_setup_execute_command_parser(self, execute_parser):
         """Test that execute command parser is set up correctly."""
-        import argparse
-        
-        parser = argparse.ArgumentParser()
-        subparsers = parser.add_subparsers()
-        
-        setup_execute_command(subparsers)
-        
         # Test parsing execute command
-        args = parser.parse_args(['execute', 'testcmd'])
+        args = execute_parser.parse_args(['execute', 'testcmd'])
         assert args.command_name == 'testcmd'
         assert args.platform == 'auto'
         assert args.timeout_help == 10
@@ -107,7 +97,6 @@ class TestCLIIntegration:
     def test_execute_wrap_command_basic(self):
         """Test basic wrap command execution."""
         from cli import execute_wrap_command
-        import argparse
         
         # Create mock args
         args = argparse.Namespace(
@@ -127,7 +116,6 @@ class TestCLIIntegration:
     def test_execute_parse_command_basic(self):
         """Test basic parse command execution."""
         from cli import execute_parse_command
-        import argparse
         
         # Create mock args
         args = argparse.Namespace(
@@ -144,7 +132,6 @@ class TestCLIIntegration:
     def test_execute_execute_command_basic(self):
         """Test basic execute command execution."""
         from cli import execute_execute_command
-        import argparse
         
         # Create mock args
         args = argparse.Namespace(
@@ -161,56 +148,56 @@ class TestCLIIntegration:
         assert isinstance(result, dict)
         assert 'status' in result
     
-    def test_cli_help_output(self):
-        """Test that CLI shows help output."""
-        result = subprocess.run(
-            [sys.executable, 'cli.py', '--help'],
-            capture_output=True,
-            text=True
-        )
+    @pytest.mark.parametrize("argv,needles", [
+        (['--help'], ['Universal Command Wrapper', 'wrap', 'parse', 'execute']),
+        (['wrap', '--help'], ['wrap', '--platform', '--output']),
+        (['parse', '--help'], ['parse']),
+        (['execute', '--help'], ['execute', '--args', '--options']),
+    ], ids=["main", "wrap", "parse", "execute"])
+    def test_cli_help_output(self, monkeypatch, capsys, argv, needles):
+        """Test that the CLI and each subcommand show help output."""
+        # Runs main() in-process; argparse exits with status 0 after --help
+        monkeypatch.setattr(sys, 'argv', ['cli.py'] + argv)
+        with pytest.raises(SystemExit) as exc_info:
+            main()
         
-        assert result.returncode == 0
-        assert 'Universal Command Wrapper' in result.stdout
-        assert 'wrap' in result.stdout
-        assert 'parse' in result.stdout
-        assert 'execute' in result.stdout
+        assert exc_info.value.code == 0
+        stdout = capsys.readouterr().out
+        for needle in needles:
+            assert needle in stdout
     
-    def test_cli_wrap_help(self):
-        """Test wrap command help."""
-        result = subprocess.run(
-            [sys.executable, 'cli.py', 'wrap', '--help'],
-            capture_output=True,
-            text=True
+    def test_dumps_orjson_and_fallback_agree(self):
+        """Test that _dumps gives the same JSON with and without orjson."""
+        result = {"status": "success", "description": "Café ☕", "count": 2}
+        expected = '{\n  "status": "success",\n  "description": "Café ☕",\n  "count": 2\n}'
+        fake_orjson = SimpleNamespace(
+            OPT_INDENT_2=2,
+            dumps=MagicMock(return_value=expected.encode('utf-8'))
         )
         
-        assert result.returncode == 0
-        assert 'wrap' in result.stdout
-        assert '--platform' in result.stdout
-        assert '--output' in result.stdout
-    
-    def test_cli_parse_help(self):
-        """Test parse command help."""
-        result = subprocess.run(
-            [sys.executable, 'cli.py', 'parse', '--help'],
-            capture_output=True,
-            text=True
-        )
+        with patch('cli.orjson', fake_orjson):
+            assert _dumps(result) == expected.encode('utf-8')
+        fake_orjson.dumps.assert_called_once_with(result, option=2)
         
-        assert result.returncode == 0
-        assert 'parse' in result.stdout
+        with patch('cli.orjson', None):
+            assert _dumps(result) == expected.encode('utf-8')
     
-    def test_cli_execute_help(self):
-        """Test execute command help."""
-        result = subprocess.run(
-            [sys.executable, 'cli.py', 'execute', '--help'],
-            capture_output=True,
-            text=True
-        )
-        
-        assert result.returncode == 0
-        assert 'execute' in result.stdout
-        assert '--args' in result.stdout
-        assert '--options' in result.stdout
+    def test_print_json_survives_non_utf8_stdout(self):
+        """Test that JSON output with non-ASCII text works on a stdout that cannot encode it."""
+        result = {"status": "success", "description": "Café ☕"}
+        raw = io.BytesIO()
+        ascii_stdout = io.TextIOWrapper(raw, encoding='ascii')
+        
+        with patch('sys.stdout', ascii_stdout):
+            _print_json(result)
+        assert json.loads(raw.getvalue().decode('utf-8')) == result
+        
+        # Streams without a byte buffer get ASCII-escaped JSON instead
+        text_stdout = io.StringIO()
+        with patch('sys.stdout', text_stdout):
+            _print_json(result)
+        assert text_stdout.getvalue().isascii()
+        assert json.loads(text_stdout.getvalue()) == result
 
 
 if __name__ == "__main__":
@@ -17,13 +17,11 @@ from __init__ import UniversalCommandWrapper
 class TestDocumentationExamples:
     """Test cases for documentation examples."""
     
-    def test_basic_library_usage_example(self):
+    def test_basic_library_usage_example(self, ucw, parsed_spec):
         """Test the basic library usage example from README."""
         # This is the example from README.md
-        ucw = UniversalCommandWrapper()
-        
         # Parse and wrap a command
-        spec = ucw.parse_command("echo")
+        spec = parsed_spec("echo")
         wrapper = ucw.build_wrapper(spec)
         
         # Execute the command with arguments
@@ -44,69 +42,39 @@ class TestDocumentationExamples:
         assert ucw_windows.platform == "windows"
         assert ucw_posix.platform == "posix"
     
-    def test_file_operations_example(self):
-        """Test the file operations example from README."""
-        ucw = UniversalCommandWrapper()
-        
-        # Wrap cp command
-        cp_spec = ucw.parse_command("cp")
-        cp_wrapper = ucw.build_wrapper(cp_spec)
-        
+    @pytest.mark.parametrize("command_name,run_args", [
         # Copy file (this will fail on Windows but should not crash)
-        result = cp_wrapper.run("source.txt", "dest.txt")
-        
-        # Should not crash, even if command fails
-        assert hasattr(result, 'success')
-        assert hasattr(result, 'command')
-    
-    def test_text_processing_example(self):
-        """Test the text processing example from README."""
-        ucw = UniversalCommandWrapper()
-        
-        # Wrap grep command
-        grep_spec = ucw.parse_command("grep")
-        grep_wrapper = ucw.build_wrapper(grep_spec)
-        
+        ("cp", ("source.txt", "dest.txt")),
         # Search for text (this will fail on Windows but should not crash)
-        result = grep_wrapper.run("error", "logfile.txt")
-        
-        # Should not crash, even if command fails
-        assert hasattr(result, 'success')
-        assert hasattr(result, 'command')
-    
-    def test_system_information_example(self):
-        """Test the system information example from README."""
-        ucw = UniversalCommandWrapper()
-        
-        # Wrap ls command
-        ls_spec = ucw.parse_command("ls")
-        ls_wrapper = ucw.build_wrapper(ls_spec)
-        
+        ("grep", ("error", "logfile.txt")),
         # List directory contents
-        result = ls_wrapper.run()
+        ("ls", ()),
+    ], ids=["file-operations", "text-processing", "system-information"])
+    def test_command_examples(self, ucw, parsed_spec, command_name, run_args):
+        """Test the file operations, text processing and system information examples from README."""
+        # Wrap the command
+        wrapper = ucw.build_wrapper(parsed_spec(command_name))
+        
+        result = wrapper.run(*run_args)
         
         # Should not crash, even if command fails
         assert hasattr(result, 'success')
         assert hasattr(result, 'command')
     
-    def test_mcp_plugin_generation_example(self):
+    def test_mcp_plugin_generation_example(self, ucw, parsed_spec):
         """Test the MCP plugin generation example from README."""
-        ucw = UniversalCommandWrapper()
-        
         # Generate MCP plugin for tar command
-        tar_spec = ucw.parse_command("tar")
+        tar_spec = parsed_spec("tar")
         tar_wrapper = ucw.build_wrapper(tar_spec)
         
         # Should create wrapper successfully
         assert tar_wrapper.command_name == "tar"
         assert tar_wrapper.spec == tar_spec
     
-    def test_kwargs_normalization_examples(self):
+    def test_kwargs_normalization_examples(self, ucw, parsed_spec):
         """Test the kwargs normalization examples from README."""
-        ucw = UniversalCommandWrapper()
-        
         # Test with a command that might have options
-        spec = ucw.parse_command("echo")
+        spec = parsed_spec("echo")
         wrapper = ucw.build_wrapper(spec)
         
         # Test kwargs usage (even if no options are parsed)
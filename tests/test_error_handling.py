@@ -116,7 +116,10 @@ class TestErrorHandling:
     
     def test_unsupported_system_platform(self):
         """Test unsupported system platform."""
-        with patch('platform.system', return_value="unsupported"):
+        # The host platform is detected once at import time
+        module = UniversalCommandWrapper.__module__
+        with patch(f"{module}._SYSTEM", "unsupported"), \
+                patch(f"{module}._DEFAULT_PLATFORM", None):
             with pytest.raises(ValueError, match="Unsupported platform"):
                 UniversalCommandWrapper(platform_name="auto")
     
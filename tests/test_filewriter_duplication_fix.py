@@ -9,6 +9,7 @@ import sys
 import tempfile
 import os
 from pathlib import Path
+from unittest.mock import patch
 
 # Add the parent directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -278,6 +279,162 @@ print('Hello World')"""
         # Should keep the rest of the content
         assert "print('Hello World')" in result
 
+    
+    def test_locate_section_finds_markers_in_single_pass(self):
+        """Test that _locate_section reports section bounds and marker presence."""
+        writer = FileWriter()
+        
+        content = "header\n# UCW-BEGIN: testcmd\nbody\n# UCW-END: testcmd\nfooter"
+        start_idx, end_idx, has_markers = writer._locate_section(content, "testcmd")
+        assert has_markers
+        assert content[start_idx:end_idx] == "# UCW-BEGIN: testcmd\nbody\n# UCW-END: testcmd"
+        
+        # Other command's markers present, but not this one
+        assert writer._locate_section(content, "othercmd") == (-1, -1, True)
+        
+        # No markers at all
+        assert writer._locate_section("print('hi')", "testcmd") == (-1, -1, False)
+
+    
+    def test_index_sections_indexes_all_commands(self):
+        """Test that _index_sections maps every command to its section bounds."""
+        writer = FileWriter()
+        
+        content = (
+            "# UCW-BEGIN: cmd1\none\n# UCW-END: cmd1\n"
+            "# UCW-BEGIN: cmd2\ntwo\n# UCW-END: cmd2\n"
+            "# UCW-BEGIN: broken\n"
+        )
+        sections = writer._index_sections(content)
+        
+        assert set(sections) == {"cmd1", "cmd2", "broken"}
+        begin, end = sections["cmd2"]
+        assert content[begin:end] == "# UCW-BEGIN: cmd2\ntwo\n# UCW-END: cmd2"
+        assert sections["broken"] == (-1, -1)
+
+    
+    def test_unchanged_output_is_not_rewritten(self):
+        """Test that regenerating identical content leaves the file untouched."""
+        writer = FileWriter()
+        
+        spec = CommandSpec(
+            name="testcmd",
+            usage="testcmd [options]",
+            options=[
+                OptionSpec(flag="--verbose", takes_value=False, description="Verbose output")
+            ],
+            positional_args=[],
+            description="Test command",
+            examples=[]
+        )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file = os.path.join(temp_dir, "cli.py")
+            writer.write_wrapper(spec, None, temp_file)
+            
+            # Backdate the file so a rewrite would be visible in its mtime
+            os.utime(temp_file, ns=(1_000_000_000, 1_000_000_000))
+            writer.write_wrapper(spec, None, temp_file)
+            
+            assert os.stat(temp_file).st_mtime_ns == 1_000_000_000
+            # No temporary files are left behind
+            assert os.listdir(temp_dir) == ["cli.py"]
+
+    
+    def test_update_wrapper_section_is_idempotent(self):
+        """Test that replacing a section with the same code does not grow the file."""
+        writer = FileWriter()
+        
+        existing_content = "header\n# UCW-BEGIN: testcmd\nold\n# UCW-END: testcmd\nfooter\n"
+        new_code = "def new_function():\n    pass"
+        
+        once = writer._update_wrapper_section(existing_content, "testcmd", new_code)
+        twice = writer._update_wrapper_section(once, "testcmd", new_code)
+        indexed = writer._update_wrapper_section(
+            once, "testcmd", new_code, sections=writer._index_sections(once)
+        )
+        
+        assert once == twice == indexed
+        assert once.endswith("# UCW-END: testcmd\nfooter\n")
+    
+    def test_update_skips_regeneration_when_hash_matches(self):
+        """Test that a section carrying the current input hash is not regenerated."""
+        writer = FileWriter()
+        
+        spec = CommandSpec(
+            name="testcmd",
+            usage="testcmd [options]",
+            options=[
+                OptionSpec(flag="--verbose", takes_value=False, description="Verbose output")
+            ],
+            description="Test command"
+        )
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_file = os.path.join(temp_dir, "cli.py")
+            with open(temp_file, 'w') as f:
+                f.write("# UCW-BEGIN: testcmd\nold\n# UCW-END: testcmd\n")
+            
+            writer.write_wrapper(spec, None, temp_file, update=True)
+            with open(temp_file, 'r') as f:
+                content = f.read()
+            assert f"# UCW-HASH: {writer._section_hash(spec)}" in content
+            
+            with patch.object(writer.wrapper_builder, 'generate_mcp_plugin_code') as mock_generate:
+                writer.write_wrapper(spec, None, temp_file, update=True)
+            mock_generate.assert_not_called()
+            
+            # A changed spec produces a new hash and is regenerated
+            changed = CommandSpec(name="testcmd", usage="testcmd [options]", options=[])
+            writer.write_wrapper(changed, None, temp_file, update=True)
+            with open(temp_file, 'r') as f:
+                updated = f.read()
+            assert f"# UCW-HASH: {writer._section_hash(changed)}" in updated
+            assert updated.count("# UCW-BEGIN: testcmd") == 1
+
+    
+    @pytest.mark.skipif(os.name == 'nt', reason="POSIX permission bits")
+    def test_write_keeps_mode_regardless_of_umask(self):
+        """Test that new files get 0o755 and updates keep an existing mode under any umask."""
+        writer = FileWriter()
+        spec = CommandSpec(name="testcmd", usage="testcmd [options]", options=[])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            new_file = os.path.join(temp_dir, "new.py")
+            existing_file = os.path.join(temp_dir, "existing.py")
+            with open(existing_file, 'w') as f:
+                f.write("# placeholder\n")
+            os.chmod(existing_file, 0o775)
+            
+            old_umask = os.umask(0o077)
+            try:
+                writer.write_wrapper(spec, None, new_file)
+                writer.write_wrapper(spec, None, existing_file, update=True)
+            finally:
+                os.umask(old_umask)
+            
+            assert os.stat(new_file).st_mode & 0o777 == 0o755
+            assert os.stat(existing_file).st_mode & 0o777 == 0o775
+    
+    @pytest.mark.skipif(os.name == 'nt', reason="symlinks need privileges on Windows")
+    def test_write_goes_through_symlink(self):
+        """Test that writing to a symlinked output path updates the target and keeps the link."""
+        writer = FileWriter()
+        spec = CommandSpec(name="testcmd", usage="testcmd [options]", options=[])
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "real_cli.py")
+            link = os.path.join(temp_dir, "cli.py")
+            with open(target, 'w') as f:
+                f.write("# placeholder\n")
+            os.symlink(target, link)
+            
+            writer.write_wrapper(spec, None, link)
+            
+            assert os.path.islink(link)
+            with open(target, 'r') as f:
+                assert "def main" in f.read()
+            assert sorted(os.listdir(temp_dir)) == ["cli.py", "real_cli.py"]
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -4,9 +4,10 @@ Unit tests for POSIX parser.
 This module tests the PosixParser class functionality.
 """
 
+import asyncio
 import pytest
 import subprocess
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import sys
 from pathlib import Path
 
@@ -48,7 +49,7 @@ class TestPosixParser:
         with patch('subprocess.run') as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=0,
-                stdout="LS(1)                    User Commands                   LS(1)\n\nNAME\n       ls - list directory contents\n\nSYNOPSIS\n       ls [OPTION]... [FILE]...\n\nDESCRIPTION\n       List  information  about  the FILEs (the current directory by default).\n       Sort entries alphabetically if none of -cftuvSUX nor --sort is specified.\n\n       Mandatory arguments to long options are mandatory for short options too.\n\n       -a, --all\n              do not ignore entries starting with .\n\n       -l     use a long listing format\n\n       -h, --human-readable\n              with -l, print sizes in human readable format (e.g., 1K 234M 2G)\n\n       -r, --reverse\n              reverse order while sorting\n\n       -R, --recursive\n              list subdirectories recursively\n\n       -t     sort by modification time, newest first\n\n       -S     sort by file size, largest first\n\n       -X     sort alphabetically by entry extension\n\n       -U     do not sort; list entries in directory order\n\n       -v     natural sort of (version) numbers within text\n\n       -c     with -l: sort by, and show, ctime (time of last modification of\n              file status information)  with -l: show ctime and sort by name;\n              otherwise: sort by ctime, newest first\n\n       -f     do not sort, enable -aU, disable -ls --color\n\n       -u     with -l: sort by, and show, access time  with -l: show access time\n              and sort by name; otherwise: sort by access time\n\n       --sort=WORD\n              sort by WORD instead of name: none (-U), size (-S), time (-t),\n              version (-v), extension (-X)\n\n       --time=WORD\n              with -l, show time as WORD instead of default modification time:\n              atime (-u); access (-u), use (-u), ctime (-c), or status (-c);\n              use specified time as sort key if --sort=time\n\n       --time-style=STYLE\n              with -l, show times using style STYLE: full-iso, long-iso, iso,\n              locale, or +FORMAT; FORMAT is interpreted like in date(1); if\n              FORMAT is FORMAT1<newline>FORMAT2, then FORMAT1 applies to\n              non-recent files and FORMAT2 to recent files; if STYLE is\n              prefixed with 'posix-', STYLE applies only outside the POSIX\n              locale\n\n       --full-time\n              like -l --time-style=full-iso\n\n       --color[=WHEN]\n              colorize the output; WHEN can be 'never', 'auto', or 'always'\n              (the default); more info below\n\n       --indicator-style=WORD\n              append indicator with style WORD to entry names: none (default),\n              slash (-p), file-type (--file-type), classify (-F)\n\n       --quoting-style=WORD\n              use quoting style WORD for entry names: literal, locale,\n              shell, shell-always, shell-escape, shell-escape-always, c, escape\n\n       --show-control-chars\n              show non graphic characters as-is (default is to display as\n              ^char)\n\n       --hide=PATTERN\n              do not list implied entries matching shell PATTERN (overridden\n              by -a or -A)\n\n       -b, --escape\n              print C-style escapes for nongraphic characters\n\n       -d, --directory\n              list directories themselves, not their contents\n\n       -F, --classify\n              append indicator (one of */=>@|) to entries\n\n       --file-type\n              likewise, except do not append '*' (equivalent to --classify)\n\n       --format=WORD\n              across -x, commas -m, horizontal -x, long -l, single-column -1,\n              verbose -l, vertical -C\n\n       --full-time\n              like -l --time-style=full-iso\n\n       -g     like -l, but do not list owner\n\n       --group-directories-first\n              group directories before files;\n\n              can be used with --sort, but sorting is disabled\n\n       -G, --no-group\n              in a long listing, don't print group names\n\n       -H, --dereference-command-line\n              follow symbolic links listed on the command line\n\n       --dereference-command-line-symlink-to-dir\n              follow each command line symbolic link that points to a directory\n\n       --hide=PATTERN\n              do not list implied entries matching shell PATTERN (overridden\n              by -a or -A)\n\n       --indicator-style=WORD\n              append indicator with style WORD to entry names: none (default),\n              slash (-p), file-type (--file-type), classify (-F)\n\n       -i, --inode\n              print the index number of each file\n\n       -I, --ignore=PATTERN\n              do not list implied entries matching shell PATTERN\n\n       -k, --kibibytes\n              default to 1024-byte blocks\n\n       -l     use a long listing format\n\n       -L, --dereference\n              show information about the link itself rather than the file the\n              link points to\n\n       -m     fill width with a comma separated list of entries\n\n       -n, --numeric-uid-gid\n              like -l, but list numeric user and group IDs\n\n       -N, --literal\n              print entry names without quoting\n\n       -o     like -l, but do not list group information\n\n       -p, --indicator-style=slash\n              append / indicator to directories\n\n       -q, --hide-control-chars\n              print ? instead of non graphic characters\n\n       --show-control-chars\n              show non graphic characters as-is (default is to display as\n              ^char)\n\n       -Q, --quote-name\n              enclose entry names in double quotes\n\n       --quoting-style=WORD\n              use quoting style WORD for entry names: literal, locale,\n              shell, shell-always, shell-escape, shell-escape-always, c, escape\n\n       -r, --reverse\n              reverse order while sorting\n\n       -R, --recursive\n              list subdirectories recursively\n\n       -s, --size\n              print the allocated size of each file, in blocks\n\n       -S     sort by file size, largest first\n\n       -t     sort by modification time, newest first\n\n       -T, --tabsize=COLS\n              assume tab stops at each COLS instead of 8\n\n       -u     with -l: sort by, and show, access time  with -l: show access time\n              and sort by name; otherwise: sort by access time\n\n       -U     do not sort; list entries in directory order\n\n       -v     natural sort of (version) numbers within text\n\n       --version\n              output version information and exit\n\n       -w, --width=COLS\n              assume screen width instead of current value\n\n       -x     list entries by lines instead of by columns\n\n       -X     sort alphabetically by entry extension\n\n       -1     list one file per line\n\n       --help display this help and exit\n\n       --version\n              output version information and exit\n\nAUTHOR\n       Written by Richard M. Stallman and David MacKenzie.\n\nREPORTING BUGS\n       GNU coreutils online help: <https://www.gnu.org/software/coreutils/>\n       Report ls translation bugs to <https://translationproject.org/team/>\n\nCOPYRIGHT\n       Copyright © 2020 Free Software Foundation, Inc.  License GPLv3+: GNU\n       GPL version 3 or later <https://gnu.org/licenses/gpl.html>.\n       This is free software: you are free to change and redistribute it.\n       There is NO WARRANTY, to the extent permitted by law.\n\nSEE ALSO\n       The full documentation for ls is maintained as a Texinfo manual.  If\n       the info and ls programs are properly installed at your site, the\n       command\n\n              info ls\n\n       should give you access to the complete manual.\n\nGNU coreutils 8.32                  September 2020                  LS(1)"
+                stdout="LS(1)                    User Commands                   LS(1)\n\nNAME\n       ls - list directory contents\n\nSYNOPSIS\n       ls [OPTION]... [FILE]...\n\nDESCRIPTION\n       List  information  about  the FILEs (the current directory by default).\n       Sort entries alphabetically if none of -cftuvSUX nor --sort is specified.\n\n       Mandatory arguments to long options are mandatory for short options too.\n\n       -a, --all\n              do not ignore entries starting with .\n\n       -l     use a long listing format\n\n       -h, --human-readable\n              with -l, print sizes in human readable format (e.g., 1K 234M 2G)\n\n       -r, --reverse\n              reverse order while sorting\n\n       -R, --recursive\n              list subdirectories recursively\n\n       -t     sort by modification time, newest first\n\n       -S     sort by file size, largest first\n\n       -X     sort alphabetically by entry extension\n\n       -U     do not sort; list entries in directory order\n\n       -v     natural sort of (version) numbers within text\n\n       -c     with -l: sort by, and show, ctime (time of last modification of\n              file status information)  with -l: show ctime and sort by name;\n              otherwise: sort by ctime, newest first\n\n       -f     do not sort, enable -aU, disable -ls --color\n\n       -u     with -l: sort by, and show, access time  with -l: show access time\n              and sort by name; otherwise: sort by access time\n\n       --sort=WORD\n              sort by WORD instead of name: none (-U), size (-S), time (-t),\n              version (-v), extension (-X)\n\n       --time=WORD\n              with -l, show time as WORD instead of default modification time:\n              atime (-u); access (-u), use (-u), ctime (-c), or status (-c);\n              use specified time as sort key if --sort=time\n\n       --time-style=STYLE\n              with -l, show times using style STYLE: full-iso, long-iso, iso,\n              locale, or +FORMAT; FORMAT is interpreted like in date(1); if\n              FORMAT is FORMAT1<newline>FORMAT2, then FORMAT1 applies to\n              non-recent files and FORMAT2 to recent files; if STYLE is\n              prefixed with 'posix-', STYLE applies only outside the POSIX\n              locale\n\n       --full-time\n              like -l --time-style=full-iso\n\n       --color[=WHEN]\n              colorize the output; WHEN can be 'never', 'auto', or 'always'\n              (the default); more info below\n\n       --indicator-style=WORD\n              append indicator with style WORD to entry names: none (default),\n              slash (-p), file-type (--file-type), classify (-F)\n\n       --quoting-style=WORD\n              use quoting style WORD for entry names: literal, locale,\n              shell, shell-always, shell-escape, shell-escape-always, c, escape\n\n       --show-control-chars\n              show non graphic characters as-is (default is to display as\n              ^char)\n\n       --hide=PATTERN\n              do not list implied entries matching shell PATTERN (overridden\n              by -a or -A)\n\n       -b, --escape\n              print C-style escapes for nongraphic characters\n\n       -d, --directory\n              list directories themselves, not their contents\n\n       -F, --classify\n              append indicator (one of */=>@|) to entries\n\n       --file-type\n              likewise, except do not append '*' (equivalent to --classify)\n\n       --format=WORD\n              across -x, commas -m, horizontal -x, long -l, single-column -1,\n              verbose -l, vertical -C\n\n       --full-time\n              like -l --time-style=full-iso\n\n       -g     like -l, but do not list owner\n\n       --group-directories-first\n              group directories before files;\n\n              can be used with --sort, but sorting is disabled\n\n       -G, --no-group\n              in a long listing, don't print group names\n\n       -H, --dereference-command-line\n              follow symbolic links listed on the command line\n\n       --dereference-command-line-symlink-to-dir\n              follow each command line symbolic link that points to a directory\n\n       --hide=PATTERN\n              do not list implied entries matching shell PATTERN (overridden\n              by -a or -A)\n\n       --indicator-style=WORD\n              append indicator with style WORD to entry names: none (default),\n              slash (-p), file-type (--file-type), classify (-F)\n\n       -i, --inode\n              print the index number of each file\n\n       -I, --ignore=PATTERN\n              do not list implied entries matching shell PATTERN\n\n       -k, --kibibytes\n              default to 1024-byte blocks\n\n       -l     use a long listing format\n\n       -L, --dereference\n              show information about the link itself rather than the file the\n              link points to\n\n       -m     fill width with a comma separated list of entries\n\n       -n, --numeric-uid-gid\n              like -l, but list numeric user and group IDs\n\n       -N, --literal\n              print entry names without quoting\n\n       -o     like -l, but do not list group information\n\n       -p, --indicator-style=slash\n              append / indicator to directories\n\n       -q, --hide-control-chars\n              print ? instead of non graphic characters\n\n       --show-control-chars\n              show non graphic characters as-is (default is to display as\n              ^char)\n\n       -Q, --quote-name\n              enclose entry names in double quotes\n\n       --quoting-style=WORD\n              use quoting style WORD for entry names: literal, locale,\n              shell, shell-always, shell-escape, shell-escape-always, c, escape\n\n       -r, --reverse\n              reverse order while sorting\n\n       -R, --recursive\n              list subdirectories recursively\n\n       -s, --size\n              print the allocated size of each file, in blocks\n\n       -S     sort by file size, largest first\n\n       -t     sort by modification time, newest first\n\n       -T, --tabsize=COLS\n              assume tab stops at each COLS instead of 8\n\n       -u     with -l: sort by, and show, access time  with -l: show access time\n              and sort by name; otherwise: sort by access time\n\n       -U     do not sort; list entries in directory order\n\n       -v     natural sort of (version) numbers within text\n\n       --version\n              output version information and exit\n\n       -w, --width=COLS\n              assume screen width instead of current value\n\n       -x     list entries by lines instead of by columns\n\n       -X     sort alphabetically by entry extension\n\n       -1     list one file per line\n\n       --help display this help and exit\n\n       --version\n              output version information and exit\n\nAUTHOR\n       Written by Richard M. Stallman and David MacKenzie.\n\nREPORTING BUGS\n       GNU coreutils online help: <https://www.gnu.org/software/coreutils/>\n       Report ls translation bugs to <https://translationproject.org/team/>\n\nCOPYRIGHT\n       Copyright © 2020 Free Software Foundation, Inc.  License GPLv3+: GNU\n       GPL version 3 or later <https://gnu.org/licenses/gpl.html>.\n       This is free software: you are free to change and redistribute it.\n       There is NO WARRANTY, to the extent permitted by law.\n\nSEE ALSO\n       The full documentation for ls is maintained as a Texinfo manual.  If\n       the info and ls programs are properly installed at your site, the\n       command\n\n              info ls\n\n       should give you access to the complete manual.\n\nGNU coreutils 8.32                  September 2020                  LS(1)".encode()
             )
             
             result = parser._try_alternative_help("ls")
@@ -63,8 +64,8 @@ class TestPosixParser:
         with patch('subprocess.run') as mock_run:
             mock_run.return_value = MagicMock(
                 returncode=1,
-                stdout="",
-                stderr="No manual entry for nonexistent"
+                stdout=b"",
+                stderr=b"No manual entry for nonexistent"
             )
             
             result = parser._try_alternative_help("nonexistent")
@@ -80,6 +81,88 @@ class TestPosixParser:
             result = parser._try_alternative_help("ls")
             assert result is None
     
+    def test_parse_option_line_interns_flags(self):
+        """Test that the same flag parsed from different lines is one string object."""
+        parser = PosixParser()
+        
+        first = parser._parse_option_line("  --" + "verbose    explain what is being done")
+        second = parser._parse_option_line("  -v, --" + "verbose    print more")
+        assert first.flag == second.flag == "--verbose"
+        assert first.flag is second.flag
+    
+    def test_try_alternative_help_async_matches_sync(self):
+        """Test that the asyncio fallback returns the same text as the blocking one."""
+        parser = PosixParser()
+        man_page = b"PYTHON(1)    General Commands Manual    PYTHON(1)"
+        
+        def fake_run(cmd, **kwargs):
+            if cmd[0] == 'man' and cmd[1] == sys.executable:
+                return MagicMock(returncode=0, stdout=man_page)
+            raise FileNotFoundError(cmd[0])
+        
+        async def fake_exec(*cmd, **kwargs):
+            fake_run(list(cmd))
+            proc = MagicMock(returncode=0)
+            proc.communicate = AsyncMock(return_value=(man_page, None))
+            return proc
+        
+        with patch('subprocess.run', side_effect=fake_run), \
+                patch('asyncio.create_subprocess_exec', fake_exec):
+            assert asyncio.run(parser._try_alternative_help_async(sys.executable)) == \
+                parser._try_alternative_help(sys.executable) == man_page.decode()
+            assert asyncio.run(parser._try_alternative_help_async("nonexistent_command_12345")) is None
+    
+    def test_try_alternative_help_async_kills_child_on_timeout_and_cancel(self):
+        """Test that the asyncio fallback kills its child on timeout and on cancellation."""
+        parser = PosixParser(timeout=0.05)
+        procs = []
+        
+        async def hang():
+            await asyncio.sleep(3600)
+        
+        async def fake_exec(*cmd, **kwargs):
+            proc = MagicMock(returncode=None)
+            proc.communicate = hang
+            proc.wait = AsyncMock(return_value=-9)
+            procs.append(proc)
+            return proc
+        
+        async def cancel_midway():
+            parser.timeout = 3600
+            task = asyncio.ensure_future(parser._try_alternative_help_async("hangs"))
+            while not procs:
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        with patch('asyncio.create_subprocess_exec', fake_exec):
+            assert asyncio.run(parser._try_alternative_help_async("hangs")) is None
+            assert len(procs) == 2
+            for proc in procs:
+                proc.kill.assert_called_once()
+                proc.wait.assert_awaited_once()
+            
+            procs.clear()
+            asyncio.run(cancel_midway())
+            assert len(procs) == 1
+            procs[0].kill.assert_called_once()
+            procs[0].wait.assert_awaited_once()
+    
+    def test_parse_help_text_skips_failed_lookups(self):
+        """Test that failed-lookup messages produce an empty spec without scanning."""
+        parser = PosixParser()
+        
+        with patch.object(parser, '_scan_help_text') as mock_scan:
+            spec = parser._parse_help_text("ls", "Help command timed out for ls")
+        
+        mock_scan.assert_not_called()
+        assert spec.name == "ls"
+        assert spec.usage == ""
+        assert len(spec.options) == 0
+        assert spec.description == ""
+    
     def test_is_option_line(self):
         """Test _is_option_line method."""
         parser = PosixParser()
@@ -202,6 +285,33 @@ DESCRIPTION
                 assert spec.name == "nonexistent"
                 assert spec.description == ""
                 assert len(spec.options) == 0
+    
+    def test_parsed_spec_is_immutable(self):
+        """Test that parsed specs are frozen and carry tuple sequences."""
+        import dataclasses
+        
+        parser = PosixParser()
+        help_text = "Usage: cp [OPTION]... SOURCE DEST\nCopy files.\n\n  -a, --archive  same as -dR"
+        spec = parser._parse_help_text("cp", help_text)
+        
+        assert isinstance(spec.positional_args, tuple)
+        assert isinstance(spec.examples, tuple)
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            spec.name = "mv"
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            spec.options[0].takes_value = True
+    
+    def test_prose_lines_skip_option_check(self):
+        """Test that only lines starting with a dash reach _is_option_line."""
+        parser = PosixParser()
+        help_text = "Usage: ls [OPTION]...\nList files.\n\n  -a, --all  show all\n  plain prose line"
+        
+        with patch.object(parser, '_is_option_line', wraps=parser._is_option_line) as mock_check:
+            spec = parser._parse_help_text("ls", help_text)
+        
+        mock_check.assert_called_once_with("-a, --all  show all")
+        assert [option.flag for option in spec.options] == ["--all"]
 
 
 if __name__ == "__main__":
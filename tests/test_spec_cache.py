@@ -0,0 +1,233 @@
+"""
+Test on-disk CommandSpec caching.
+
+This module tests that UniversalCommandWrapper.parse_command caches parsed
+specs keyed on the resolved executable and its modification time.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+# Add the parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import __init__ as ucw_module
+from __init__ import UniversalCommandWrapper
+from models import CommandSpec, OptionSpec
+from parser.posix import PosixParser
+
+# An executable guaranteed to resolve on every platform
+PYTHON = sys.executable
+
+
+def _make_spec(name: str) -> CommandSpec:
+    return CommandSpec(
+        name=name,
+        usage=f"{name} [OPTION]...",
+        options=[OptionSpec(flag="--all", takes_value=False, description="Show all")],
+        positional_args=(),
+        description="Test command",
+        examples=()
+    )
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """Point the spec cache at a temporary directory."""
+    with patch.dict(os.environ, {'UCW_CACHE_DIR': str(tmp_path)}):
+        os.environ.pop('UCW_CACHE_DISABLE', None)
+        yield tmp_path
+    ucw_module._SPEC_MEMO.clear()
+    PosixParser.clear_help_cache()
+
+
+class TestSpecCache:
+    """Test cases for the on-disk spec cache."""
+
+    def test_second_parse_uses_cache(self, cache_dir):
+        """Test that a cached spec is returned without invoking the parser."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+
+        with patch.object(ucw.parser, 'parse_command', return_value=_make_spec(PYTHON)) as mock_parse:
+            first = ucw.parse_command(PYTHON)
+            second = ucw.parse_command(PYTHON)
+
+        assert mock_parse.call_count == 1
+        assert first == second
+        assert list((cache_dir / 'specs').glob('*.json'))
+
+    def test_cache_survives_new_process(self, cache_dir):
+        """Test that a spec written to disk is reloaded once memory is cleared."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+        spec = _make_spec(PYTHON)
+        
+        with patch.object(ucw.parser, 'parse_command', return_value=spec):
+            ucw.parse_command(PYTHON)
+        
+        # Simulate a fresh interpreter
+        ucw_module._SPEC_MEMO.clear()
+        ucw = UniversalCommandWrapper(platform_name="posix")
+        
+        with patch.object(ucw.parser, 'parse_command') as mock_parse:
+            reloaded = ucw.parse_command(PYTHON)
+        
+        mock_parse.assert_not_called()
+        assert reloaded == spec
+    
+    def test_cache_disabled_by_environment(self, cache_dir):
+        """Test that UCW_CACHE_DISABLE bypasses the cache."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+
+        with patch.dict(os.environ, {'UCW_CACHE_DISABLE': '1'}):
+            with patch.object(ucw.parser, 'parse_command', return_value=_make_spec(PYTHON)) as mock_parse:
+                ucw.parse_command(PYTHON)
+                ucw.parse_command(PYTHON)
+
+        assert mock_parse.call_count == 2
+        assert not (cache_dir / 'specs').exists()
+
+    def test_unknown_command_not_cached(self, cache_dir):
+        """Test that commands not found on PATH are never cached."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+
+        spec = ucw.parse_command("nonexistent_command_12345")
+
+        assert spec.name == "nonexistent_command_12345"
+        assert not (cache_dir / 'specs').exists()
+
+    def test_empty_spec_not_cached(self, cache_dir):
+        """Test that specs from failed help lookups are not cached."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+        empty = CommandSpec(name=PYTHON, usage="", options=[])
+
+        with patch.object(ucw.parser, 'parse_command', return_value=empty) as mock_parse:
+            ucw.parse_command(PYTHON)
+            ucw.parse_command(PYTHON)
+
+        assert mock_parse.call_count == 2
+
+    def test_size_change_invalidates_cache(self, cache_dir, tmp_path):
+        """Test that rewriting an executable in place misses the cache even with the same mtime."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+        script = tmp_path / "mycmd"
+        script.write_text("#!/bin/sh\n")
+        script.chmod(0o755)
+        stat = script.stat()
+
+        before = ucw._spec_cache_path(str(script))
+        script.write_text("#!/bin/sh\necho upgraded\n")
+        os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        after = ucw._spec_cache_path(str(script))
+
+        assert before is not None and after is not None
+        assert before != after
+
+    def test_parser_change_invalidates_cache(self, cache_dir):
+        """Test that a different parser fingerprint misses the cache."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+
+        before = ucw._spec_cache_path(PYTHON)
+        with patch.object(ucw_module, '_parser_fingerprint', return_value="changed"):
+            after = ucw._spec_cache_path(PYTHON)
+        with patch.object(ucw_module, '_parser_fingerprint', return_value=None):
+            uncached = ucw._spec_cache_path(PYTHON)
+
+        assert before is not None and after is not None
+        assert before != after
+        assert uncached is None
+
+    def test_memoized_spec_not_shared(self, cache_dir):
+        """Test that mutating a returned spec's options does not affect later lookups."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+
+        with patch.object(ucw.parser, 'parse_command', return_value=_make_spec(PYTHON)):
+            first = ucw.parse_command(PYTHON)
+        first.options.clear()
+        second = ucw.parse_command(PYTHON)
+        second.options.clear()
+        third = ucw.parse_command(PYTHON)
+
+        assert [opt.flag for opt in third.options] == ["--all"]
+
+    def test_parse_many_preserves_order(self, cache_dir):
+        """Test that parse_many returns specs in input order via parse_command."""
+        ucw = UniversalCommandWrapper(platform_name="posix")
+        names = ["alpha", "beta", "gamma"]
+
+        with patch.object(ucw.parser, 'parse_command', side_effect=_make_spec) as mock_parse:
+            specs = ucw.parse_many(names, max_workers=2)
+
+        assert [spec.name for spec in specs] == names
+        assert mock_parse.call_count == 3
+        assert ucw.parse_many([]) == []
+
+
+
+HELP_TEXT = """Usage: mycmd [OPTION]... FILE
+
+Options:
+  -a, --all     show all entries
+  -n NUM        number of lines
+"""
+
+
+class TestParserCache:
+    """Test cases for the parser's help-text keyed cache."""
+
+    def test_same_help_text_skips_parsing(self, cache_dir):
+        """Test that identical help text is parsed once across parser instances."""
+        first_parser = PosixParser()
+        with patch.object(first_parser, '_get_help_text', return_value=HELP_TEXT):
+            first = first_parser.parse_command("mycmd")
+
+        second_parser = PosixParser()
+        with patch.object(second_parser, '_get_help_text', return_value=HELP_TEXT), \
+                patch.object(second_parser, '_parse_help_text') as mock_parse:
+            second = second_parser.parse_command("mycmd")
+
+        mock_parse.assert_not_called()
+        assert second == first
+        assert list((cache_dir / 'parser').glob('*.json'))
+
+    def test_changed_help_text_reparses(self, cache_dir):
+        """Test that different help text produces a different cache entry."""
+        parser = PosixParser()
+        with patch.object(parser, '_get_help_text', return_value=HELP_TEXT):
+            parser.parse_command("mycmd")
+        with patch.object(parser, '_get_help_text', return_value=HELP_TEXT + "  -q  quiet\n"):
+            spec = parser.parse_command("mycmd")
+
+        assert any(option.flag == "-q" for option in spec.options)
+        assert len(list((cache_dir / 'parser').glob('*.json'))) == 2
+
+    def test_parser_cache_disabled_by_environment(self, cache_dir):
+        """Test that UCW_PARSER_CACHE=0 bypasses the parser cache."""
+        parser = PosixParser()
+
+        with patch.dict(os.environ, {'UCW_PARSER_CACHE': '0'}), \
+                patch.object(parser, '_get_help_text', return_value=HELP_TEXT):
+            parser.parse_command("mycmd")
+
+        assert not (cache_dir / 'parser').exists()
+
+    def test_parse_results_memoized_in_process(self, cache_dir):
+        """Test that repeat parses are served from memory with their own options list."""
+        parser = PosixParser()
+
+        with patch.dict(os.environ, {'UCW_PARSER_CACHE': '0'}), \
+                patch.object(parser, '_get_help_text', return_value=HELP_TEXT):
+            first = parser.parse_command("mycmd")
+            first.options.clear()
+            with patch.object(parser, '_parse_help_text') as mock_parse:
+                second = parser.parse_command("mycmd")
+
+        mock_parse.assert_not_called()
+        assert second.options
+        assert second.usage == first.usage
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -111,6 +111,15 @@ class TestTimeoutConfiguration:
         # Verify wrapper builder has correct timeout
         assert ucw.wrapper_builder.timeout_exec == 40
     
+    def test_file_writer_shares_wrapper_builder(self):
+        """Test that the file writer reuses the timeout-configured wrapper builder."""
+        from __init__ import UniversalCommandWrapper
+        
+        ucw = UniversalCommandWrapper(timeout_exec=40)
+        
+        assert ucw.file_writer.wrapper_builder is ucw.wrapper_builder
+        assert ucw.file_writer.wrapper_builder.timeout_exec == 40
+    
     def test_command_wrapper_timeout(self):
         """Test that CommandWrapper uses the correct timeout."""
         from wrapper import CommandWrapper
@@ -32,6 +32,16 @@ class TestWindowsParser:
         command = parser._get_help_command("dir")
         assert command == ["dir", "/?"]
     
+    def test_needs_shell_only_for_builtins(self):
+        """Test that executables on PATH skip the shell and builtins use it."""
+        parser = WindowsParser()
+        
+        with patch('shutil.which', return_value=r"C:\Windows\System32\where.exe"):
+            assert parser._needs_shell("where") is False
+        
+        with patch('shutil.which', return_value=None):
+            assert parser._needs_shell("dir") is True
+    
     def test_try_alternative_help_success(self):
         """Test _try_alternative_help when /help works."""
         parser = WindowsParser()
@@ -39,7 +49,7 @@ class TestWindowsParser:
         # Mock subprocess.run to return successful result
         mock_result = MagicMock()
         mock_result.returncode = 0
-        mock_result.stdout = "Help text for command"
+        mock_result.stdout = b"Help text for command"
         
         with patch('subprocess.run', return_value=mock_result) as mock_run:
             result = parser._try_alternative_help("testcmd")
@@ -47,8 +57,8 @@ class TestWindowsParser:
             # Verify subprocess.run was called correctly
             mock_run.assert_called_once_with(
                 ["testcmd", "/help"],
-                capture_output=True,
-                text=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 shell=True,
                 timeout=parser.timeout
             )
@@ -74,7 +84,7 @@ class TestWindowsParser:
         # Mock subprocess.run to return non-zero return code
         mock_result = MagicMock()
         mock_result.returncode = 1
-        mock_result.stdout = "Error message"
+        mock_result.stdout = b"Error message"
         
         with patch('subprocess.run', return_value=mock_result):
             result = parser._try_alternative_help("testcmd")
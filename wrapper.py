@@ -5,6 +5,8 @@ This module defines the CommandWrapper class that provides callable
 wrappers for system commands.
 """
 
+import functools
+import re
 import subprocess
 import time
 from typing import Dict, Any
@@ -12,6 +14,55 @@ from typing import Dict, Any
 from models import CommandSpec, ExecutionResult, OptionSpec
 
 
+# Characters that cannot appear in a Python identifier's ASCII form
+_NON_IDENTIFIER_RE = re.compile(r'[^a-zA-Z0-9_]')
+
+
+@functools.lru_cache(maxsize=1024)
+def _flag_to_dest(flag: str) -> str:
+    """
+    Normalize a flag or argument name to a valid Python attribute name.
+    
+    Shared by the wrapper builder and CommandWrapper kwargs lookup, which
+    normalize the same few flags over and over, so results are memoized;
+    the function is pure in its argument.
+    
+    Args:
+        flag: Option flag (--some-flag, /?) or positional name (<COMMAND>)
+        
+    Returns:
+        Attribute name usable as an argparse dest
+    """
+    # Remove leading dashes and slashes
+    dest = flag.lstrip('-/')
+    
+    # Remove angle brackets for positional args (e.g., <COMMAND> -> COMMAND)
+    dest = dest.strip('<>')
+    
+    # Handle empty case
+    if not dest:
+        dest = 'empty'
+    
+    # Replace remaining dashes with underscores
+    dest = dest.replace('-', '_')
+    
+    # Handle special characters
+    if dest == '?':
+        dest = 'question'
+    elif dest.startswith('?'):
+        dest = 'question_' + dest[1:]
+    
+    # Ensure it's a valid Python identifier
+    if not dest.isidentifier():
+        # Replace invalid characters with underscores
+        dest = _NON_IDENTIFIER_RE.sub('_', dest)
+        # Ensure it doesn't start with a number
+        if dest and dest[0].isdigit():
+            dest = '_' + dest
+    
+    return dest
+
+
 class CommandWrapper:
     """Callable wrapper for a system command."""
     
@@ -29,32 +80,7 @@ class CommandWrapper:
     
     def _normalize_kwargs_key(self, key: str) -> str:
         """Normalize kwargs key to match flag destination names."""
-        # Remove leading dashes and slashes
-        dest = key.lstrip('-/')
-        
-        # Handle empty case
-        if not dest:
-            dest = 'empty'
-        
-        # Replace remaining dashes with underscores
-        dest = dest.replace('-', '_')
-        
-        # Handle special characters
-        if dest == '?':
-            dest = 'question'
-        elif dest.startswith('?'):
-            dest = 'question_' + dest[1:]
-        
-        # Ensure it's a valid Python identifier
-        if not dest.isidentifier():
-            # Replace invalid characters with underscores
-            import re
-            dest = re.sub(r'[^a-zA-Z0-9_]', '_', dest)
-            # Ensure it doesn't start with a number
-            if dest and dest[0].isdigit():
-                dest = '_' + dest
-        
-        return dest
+        return _flag_to_dest(key)
     
     def _find_option_by_dest(self, dest: str) -> OptionSpec:
         """Find option by normalized destination name."""